@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+Article = namedtuple("Article", ["title", "lang", "text"])
+
+USER_AGENT = "word-o-pedia (https://github.com/Jon-MarkHampson/word-o-pedia)"
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".cache", "word-o-pedia", "articles.sqlite3")
+
+
+class ArticleNotCached(LookupError):
+    """Raised in replay mode when an article has no local fixture."""
+
+
+def article_key(title, lang="en"):
+    """
+    Content address of an article: sha256 of the language and normalised
+    title. Like Wikipedia, only underscores, spacing and the case of the
+    first letter are ignored: 'red_dwarf' is 'Red dwarf', which is not
+    'Red Dwarf'.
+    """
+    normalised = " ".join(title.replace("_", " ").split())
+    normalised = normalised[:1].upper() + normalised[1:]
+    return hashlib.sha256(f"{lang}\0{normalised}".encode("utf-8")).hexdigest()
+
+
+def fetch_from_wikipedia(title, lang="en"):
+    """Fetches an article over the network. Returns None if the page does not exist."""
+    import wikipediaapi
+
+    wiki = wikipediaapi.Wikipedia(user_agent=USER_AGENT, language=lang)
+    page = wiki.page(title)
+    if not page.exists():
+        return None
+    return Article(page.title, lang, page.text)
+
+
+class DiskStore:
+    """
+    SQLite table of articles keyed by article_key().
+
+    Entries older than 'ttl' seconds are treated as missing. When the stored
+    text goes over 'max_bytes', the least recently read entries are removed.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, ttl=30 * 24 * 3600, max_bytes=256 * 1024 * 1024):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # WAL lets several game processes read the cache while one writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                key TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS articles_accessed_at ON articles (accessed_at);
+        """)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT title, lang, text, fetched_at FROM articles WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            title, lang, text, fetched_at = row
+            if self.ttl is not None and now - fetched_at > self.ttl:
+                self._db.execute("DELETE FROM articles WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE articles SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        return Article(title, lang, text)
+
+    def put(self, key, article):
+        now = time.time()
+        size = len(article.text.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, article.title, article.lang, article.text, size, now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM articles ORDER BY accessed_at")
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM articles WHERE key = ?", doomed)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ArticleCache:
+    """
+    Fetches Wikipedia articles through an in-process LRU and a DiskStore.
+
+    With 'replay_dir' set, articles are only read from JSON fixtures in that
+    directory (see save_fixture) and the network is never used. 'fetcher'
+    is the function called on a miss; it defaults to fetch_from_wikipedia.
+
+    A page the fetcher reports as missing is remembered for 'missing_ttl'
+    seconds, so asking for it again does not go back to the network.
+    """
+
+    def __init__(self, store=None, memory_items=64, replay_dir=None, fetcher=fetch_from_wikipedia,
+                 missing_ttl=300):
+        self.store = store
+        self.memory_items = memory_items
+        self.replay_dir = replay_dir
+        self.fetcher = fetcher
+        self.missing_ttl = missing_ttl
+        self._memory = OrderedDict()
+        self._missing = OrderedDict()  # key -> time the page was found missing
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, title, lang="en"):
+        """Returns the Article for 'title', or None if Wikipedia has no such page."""
+        key = article_key(title, lang)
+
+        with self._lock:
+            article = self._memory.get(key)
+            if article is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return article
+            missing_since = self._missing.get(key)
+            if missing_since is not None:
+                if time.time() - missing_since <= self.missing_ttl:
+                    self.hits += 1
+                    return None
+                del self._missing[key]
+
+        if self.replay_dir is not None:
+            article = load_fixture(self.replay_dir, title, lang)
+        else:
+            article = self.store.get(key) if self.store is not None else None
+            if article is None:
+                self.misses += 1
+                article = self.fetcher(title, lang)
+                if article is None:
+                    self._remember_missing(key)
+                    return None
+                if self.store is not None:
+                    self.store.put(key, article)
+            else:
+                self.hits += 1
+
+        with self._lock:
+            self._memory[key] = article
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+        return article
+
+    def _remember_missing(self, key):
+        if not self.missing_ttl:
+            return
+        with self._lock:
+            self._missing[key] = time.time()
+            self._missing.move_to_end(key)
+            while len(self._missing) > self.memory_items:
+                self._missing.popitem(last=False)
+
+
+def fixture_path(directory, title, lang="en"):
+    """Fixtures are sharded by the first two hex digits of the key."""
+    key = article_key(title, lang)
+    return os.path.join(directory, key[:2], f"{key}.json")
+
+
+def save_fixture(directory, article):
+    path = fixture_path(directory, article.title, article.lang)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(article._asdict(), f, ensure_ascii=False)
+    return path
+
+
+def load_fixture(directory, title, lang="en"):
+    path = fixture_path(directory, title, lang)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return Article(**json.load(f))
+    except FileNotFoundError:
+        raise ArticleNotCached(f"No fixture for '{title}' ({lang}) in {directory}") from None
+
+
+_default_cache = None
+
+
+def fetch_article(title, lang="en"):
+    """
+    Module-level entry point used by the game. Set WORD_O_PEDIA_REPLAY_DIR to
+    serve articles from fixtures only.
+    """
+    global _default_cache
+    if _default_cache is None:
+        replay_dir = os.environ.get("WORD_O_PEDIA_REPLAY_DIR")
+        store = None if replay_dir else DiskStore()
+        _default_cache = ArticleCache(store=store, replay_dir=replay_dir)
+    return _default_cache.get(title, lang)
@@ -0,0 +1,60 @@
+"""
+Times extract_words on a large synthetic article.
+
+    python benchmarks/bench_extractor.py [article size in MB]
+
+The article is streamed from a generator of chunks, so it never exists as a
+single string. The first run is timed; a second run under tracemalloc
+reports peak memory, which should stay flat as the size grows.
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from word_extractor import CHUNK_SIZE, extract_words  # noqa: E402
+
+
+def chunk_pool(rng, size=64):
+    """A few dozen prose-like chunks with a skewed word distribution."""
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 12)))
+                  for _ in range(20000)]
+    vocabulary += ["the", "and", "of", "which", "café", "naïve"]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [" ".join(rng.choices(vocabulary, weights, k=CHUNK_SIZE // 7)) + ". " for _ in range(size)]
+
+
+def synthetic_article(megabytes, pool):
+    """Yields roughly 'megabytes' of text by cycling through the chunk pool."""
+    remaining = megabytes * 1024 * 1024
+    index = 0
+    while remaining > 0:
+        chunk = pool[index % len(pool)]
+        remaining -= len(chunk)
+        index += 1
+        yield chunk
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    pool = chunk_pool(random.Random(0))
+
+    started = time.perf_counter()
+    words = extract_words(synthetic_article(megabytes, pool), grid_size=15, word_count=12)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    extract_words(synthetic_article(megabytes, pool), grid_size=15, word_count=12)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{megabytes} MB in {elapsed:.2f}s ({megabytes / elapsed:.1f} MB/s), "
+          f"peak memory {peak / 1024 / 1024:.1f} MB")
+    print("words:", ", ".join(words))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Benchmark sweep for grid generation and gameplay hot paths.
+
+    python benchmarks/bench_generation.py --output results.json
+    python benchmarks/bench_generation.py --baseline results.json --threshold 1.25
+
+For every grid size, word-list size and word-length distribution it builds
+puzzles with place_words_on_grid and highlights every word with
+update_game_grid, then records:
+
+  - placement success rate and attempts/rejections/backtracks per word
+    (from the PlacementStats hook in new_methods_for_grid)
+  - wall time, as the best of --repeat runs
+  - peak memory of one run, measured with tracemalloc
+  - a cProfile breakdown of the project's own functions for one run
+
+Results are written as JSON. With --baseline, each case is compared to the
+matching case in an earlier run and the script exits with status 1 if any
+wall time grew by more than --threshold, or a success rate dropped.
+"""
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import new_methods_for_grid as grid_methods  # noqa: E402
+from word_grid import WordGrid  # noqa: E402
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# (shortest, longest) word length for each distribution
+LENGTH_DISTRIBUTIONS = {
+    "short": (3, 5),
+    "mixed": (3, 12),
+    "long": (8, 15),
+}
+
+# Share of the grid's cells the word list would cover if nothing overlapped
+DENSITIES = (0.1, 0.3)
+
+
+def make_words(grid_size, density, lengths, rng):
+    shortest, longest = lengths
+    longest = min(longest, grid_size)
+    shortest = min(shortest, longest)
+    letters = grid_methods.ALPHABET.decode("ascii")
+    budget = int(grid_size * grid_size * density)
+    words = set()
+    while budget > 0:
+        word = "".join(rng.choice(letters) for _ in range(rng.randint(shortest, longest)))
+        if word not in words:
+            words.add(word)
+            budget -= len(word)
+    return sorted(words)
+
+
+def run_case(words, grid_size, seed):
+    """One full round: place the words, then highlight each of them."""
+    grid, words_positions = grid_methods.place_words_on_grid(WordGrid(grid_size), words, seed=seed)
+    for colour, word in enumerate(words_positions):
+        grid_methods.update_game_grid(grid, word, colour, words_positions)
+    return words_positions
+
+
+def profile_case(words, grid_size, seed, limit):
+    """cProfile one run and keep the project's own functions, most expensive first."""
+    profiler = cProfile.Profile()
+    profiler.runcall(run_case, words, grid_size, seed)
+    entries = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in pstats.Stats(profiler).stats.items():
+        # Builtins are listed under "~" and generated code under "<...>";
+        # neither is a real file, and abspath would put "~" in the cwd
+        if filename == "~" or filename.startswith("<"):
+            continue
+        if os.path.dirname(os.path.abspath(filename)) == PROJECT_DIR:
+            entries.append({
+                "function": f"{os.path.basename(filename)}:{line}:{name}",
+                "calls": calls,
+                "own_seconds": round(own, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            })
+    entries.sort(key=lambda entry: entry["cumulative_seconds"], reverse=True)
+    return entries[:limit]
+
+
+def measure(grid_size, word_count_label, density, distribution, repeat, profile_limit):
+    rng = random.Random(f"{grid_size}-{density}-{distribution}")
+    words = make_words(grid_size, density, LENGTH_DISTRIBUTIONS[distribution], rng)
+
+    stats = grid_methods.PlacementStats()
+    previous = grid_methods.set_placement_stats(stats)
+    try:
+        run_case(words, grid_size, seed=0)
+    finally:
+        grid_methods.set_placement_stats(previous)
+
+    timings = []
+    for run in range(repeat):
+        started = time.perf_counter()
+        run_case(words, grid_size, seed=run)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    run_case(words, grid_size, seed=0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "name": f"size={grid_size} words={word_count_label} lengths={distribution}",
+        "grid_size": grid_size,
+        "density": density,
+        "lengths": distribution,
+        "word_count": len(words),
+        "success_rate": stats.placed / stats.words if stats.words else 1.0,
+        "attempts_per_word": stats.attempts_per_word,
+        "rejections_per_word": stats.rejections / stats.words if stats.words else 0.0,
+        "backtracks": stats.backtracks,
+        "wall_seconds": min(timings),
+        "peak_memory_bytes": peak,
+        "profile": profile_case(words, grid_size, 0, profile_limit),
+    }
+
+
+def compare(results, baseline, threshold, min_delta=0.005):
+    """
+    Returns a list of regression messages against a baseline results dict.
+    A wall time only counts as a regression if it grew by more than
+    'threshold' times and by more than 'min_delta' seconds, so timer noise
+    on the small cases is ignored.
+    """
+    previous = {case["name"]: case for case in baseline["cases"]}
+    problems = []
+    for case in results["cases"]:
+        old = previous.get(case["name"])
+        if old is None:
+            continue
+        slower = case["wall_seconds"] - old["wall_seconds"]
+        if slower > min_delta and case["wall_seconds"] > old["wall_seconds"] * threshold:
+            problems.append(f"{case['name']}: wall time {old['wall_seconds']:.4f}s -> "
+                            f"{case['wall_seconds']:.4f}s")
+        if case["success_rate"] < old["success_rate"]:
+            problems.append(f"{case['name']}: success rate {old['success_rate']:.3f} -> "
+                            f"{case['success_rate']:.3f}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 50, 100, 250, 500])
+    parser.add_argument("--lengths", nargs="+", choices=sorted(LENGTH_DISTRIBUTIONS),
+                        default=sorted(LENGTH_DISTRIBUTIONS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--profile-limit", type=int, default=8)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="largest allowed wall time ratio against the baseline")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="wall time increase in seconds below which no regression is reported")
+    args = parser.parse_args(argv)
+
+    cases = []
+    for grid_size in args.sizes:
+        for density in DENSITIES:
+            for distribution in args.lengths:
+                case = measure(grid_size, f"{density:.0%}", density, distribution,
+                               args.repeat, args.profile_limit)
+                cases.append(case)
+                print(f"{case['name']:<38} {case['word_count']:>6} words  "
+                      f"placed {case['success_rate']:6.1%}  "
+                      f"{case['attempts_per_word']:8.1f} attempts/word  "
+                      f"{case['wall_seconds'] * 1000:9.2f} ms  "
+                      f"{case['peak_memory_bytes'] / 1024:9.0f} KiB")
+
+    results = {
+        "python": sys.version.split()[0],
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cases": cases,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(results, json.load(f), args.threshold, args.min_delta)
+        for problem in problems:
+            print("REGRESSION", problem)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Concurrent load test for the leaderboard.
+
+    python benchmarks/bench_leaderboard.py [existing rows] [submitters] [readers]
+
+Seeds a fresh database with 'existing rows' results, then runs submitter
+threads (through one BufferedResultWriter) next to reader threads calling
+top() and rank(). Prints write throughput and read latency percentiles.
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from leaderboard import BufferedResultWriter, Leaderboard, Result  # noqa: E402
+
+BOARDS = [(size, words) for size in (10, 15, 20, 30) for words in (5, 10, 20)]
+PLAYERS = 5000
+DURATION = 5.0
+
+
+def random_result(rng):
+    grid_size, word_count = rng.choice(BOARDS)
+    return Result(f"player{rng.randrange(PLAYERS)}", grid_size, word_count, rng.uniform(20, 900))
+
+
+def seed_rows(board, count, rng):
+    for start in range(0, count, 50000):
+        board.submit_many([random_result(rng) for _ in range(min(50000, count - start))])
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def main():
+    existing = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    submitters = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    path = os.path.join(tempfile.mkdtemp(), "leaderboard.sqlite3")
+    board = Leaderboard(path)
+    started = time.perf_counter()
+    seed_rows(board, existing, random.Random(0))
+    print(f"seeded {existing} rows in {time.perf_counter() - started:.1f}s")
+
+    writer = BufferedResultWriter(Leaderboard(path))
+    stop = threading.Event()
+    submitted = [0] * submitters
+    latencies = [[] for _ in range(readers)]
+
+    def submit(index):
+        rng = random.Random(index)
+        while not stop.is_set():
+            writer.submit(*random_result(rng))
+            submitted[index] += 1
+            time.sleep(0.0005)
+
+    def read(index):
+        rng = random.Random(1000 + index)
+        reader = Leaderboard(path)
+        while not stop.is_set():
+            grid_size, word_count = rng.choice(BOARDS)
+            began = time.perf_counter()
+            reader.top(grid_size, word_count, 10)
+            reader.rank(f"player{rng.randrange(PLAYERS)}", grid_size, word_count)
+            latencies[index].append(time.perf_counter() - began)
+        reader.close()
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(submitters)]
+    threads += [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    writer.flush()
+    writer.close()
+
+    reads = [latency for per_reader in latencies for latency in per_reader]
+    print(f"writes: {sum(submitted) / DURATION:.0f}/s submitted, "
+          f"{writer.results_written} written in {writer.batches_written} batches")
+    print(f"reads (top + rank): {len(reads) / DURATION:.0f}/s, "
+          f"p50 {percentile(reads, 0.5) * 1000:.2f}ms, p99 {percentile(reads, 0.99) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter, namedtuple
+
+Result = namedtuple("Result", ["username", "grid_size", "word_count", "completion_time"])
+
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".cache", "word-o-pedia", "leaderboard.sqlite3")
+
+# Best times are grouped into buckets that are each 0.5% wider than the
+# last, so a board has under a thousand of them between 20 seconds and 15
+# minutes, and a few thousand for the whole range of times
+BUCKET_RATIO = 1.005
+_LOG_RATIO = math.log(BUCKET_RATIO)
+_SHORTEST_TIME = 0.01
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    grid_size INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    completion_time REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+-- A player's history on a board, fastest first
+CREATE INDEX IF NOT EXISTS results_player
+    ON results (username, grid_size, word_count, completion_time);
+-- Each player's best time on each board; boards are ranked from this table
+CREATE TABLE IF NOT EXISTS best_times (
+    grid_size INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    completion_time REAL NOT NULL,
+    bucket INTEGER NOT NULL,
+    PRIMARY KEY (grid_size, word_count, username)
+) WITHOUT ROWID;
+-- The bucket grows with the time, so this index is in completion time order
+-- for top-N reads and can also count inside a single bucket
+CREATE INDEX IF NOT EXISTS best_times_board
+    ON best_times (grid_size, word_count, bucket, completion_time);
+-- How many players' best times fall in each bucket of a board
+CREATE TABLE IF NOT EXISTS player_buckets (
+    grid_size INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    PRIMARY KEY (grid_size, word_count, bucket)
+) WITHOUT ROWID;
+"""
+
+
+def time_bucket(completion_time):
+    """The bucket a completion time falls in: floor(log(time) / log(BUCKET_RATIO))."""
+    return math.floor(math.log(max(completion_time, _SHORTEST_TIME)) / _LOG_RATIO)
+
+
+class Leaderboard:
+    """
+    Completion times per board (grid_size, word_count), stored in SQLite in
+    WAL mode so readers are not blocked by the writer.
+
+    Each thread gets its own connection. Every result is kept, and players
+    are ranked on each board by their fastest completion time.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as db:
+            db.executescript(SCHEMA)
+            # Databases written before best times were tracked are caught up once
+            if db.execute("SELECT EXISTS (SELECT 1 FROM results)"
+                          " AND NOT EXISTS (SELECT 1 FROM best_times)").fetchone()[0]:
+                db.execute("BEGIN IMMEDIATE")
+                self._update_best_times(db, db.execute(
+                    "SELECT username, grid_size, word_count, MIN(completion_time) FROM results"
+                    " GROUP BY username, grid_size, word_count"))
+
+    def _connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def submit(self, username, grid_size, word_count, completion_time):
+        self.submit_many([Result(username, grid_size, word_count, completion_time)])
+
+    def submit_many(self, results):
+        """Writes a batch of Results, and any new best times, in a single transaction."""
+        now = time.time()
+        results = [Result._make(result) for result in results]
+        with self._connection() as db:
+            # Taken up front so no other writer changes a best time between
+            # reading it here and replacing it
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany(
+                "INSERT INTO results (username, grid_size, word_count, completion_time, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(*result, now) for result in results],
+            )
+            self._update_best_times(db, results)
+
+    def _update_best_times(self, db, results):
+        """Stores the results that beat their player's best time, moving them between buckets."""
+        fastest = {}
+        for username, grid_size, word_count, completion_time in results:
+            key = (grid_size, word_count, username)
+            if key not in fastest or completion_time < fastest[key]:
+                fastest[key] = completion_time
+
+        improved = []
+        moves = Counter()
+        for key, completion_time in fastest.items():
+            previous = db.execute(
+                "SELECT completion_time, bucket FROM best_times"
+                " WHERE grid_size = ? AND word_count = ? AND username = ?",
+                key,
+            ).fetchone()
+            if previous is not None:
+                if previous[0] <= completion_time:
+                    continue
+                moves[key[0], key[1], previous[1]] -= 1
+            bucket = time_bucket(completion_time)
+            moves[key[0], key[1], bucket] += 1
+            improved.append((*key, completion_time, bucket))
+
+        db.executemany(
+            "INSERT INTO best_times VALUES (?, ?, ?, ?, ?) ON CONFLICT DO UPDATE"
+            " SET completion_time = excluded.completion_time, bucket = excluded.bucket",
+            improved,
+        )
+        db.executemany(
+            "INSERT INTO player_buckets VALUES (?, ?, ?, ?)"
+            " ON CONFLICT DO UPDATE SET players = players + excluded.players",
+            [(*key, change) for key, change in moves.items() if change],
+        )
+
+    def top(self, grid_size, word_count, limit=10):
+        """The 'limit' fastest players on a board as (username, best completion_time) pairs."""
+        return self._connection().execute(
+            "SELECT username, completion_time FROM best_times"
+            " WHERE grid_size = ? AND word_count = ?"
+            " ORDER BY bucket, completion_time LIMIT ?",
+            (grid_size, word_count, limit),
+        ).fetchall()
+
+    def rank(self, username, grid_size, word_count):
+        """
+        Returns (rank, best_time) for the player's best result on a board, or
+        None if they have not finished it. Players with the same best time
+        share a rank.
+
+        The best time is one primary key lookup. The rank adds up the player
+        counts of the faster buckets (under a thousand for times up to 15
+        minutes) and counts the faster players inside the player's own
+        bucket, which is 0.5% of their time wide.
+        """
+        db = self._connection()
+        row = db.execute(
+            "SELECT completion_time, bucket FROM best_times"
+            " WHERE grid_size = ? AND word_count = ? AND username = ?",
+            (grid_size, word_count, username),
+        ).fetchone()
+        if row is None:
+            return None
+        best, bucket = row
+        faster_buckets = db.execute(
+            "SELECT COALESCE(SUM(players), 0) FROM player_buckets"
+            " WHERE grid_size = ? AND word_count = ? AND bucket < ?",
+            (grid_size, word_count, bucket),
+        ).fetchone()[0]
+        faster_in_bucket = db.execute(
+            "SELECT COUNT(*) FROM best_times"
+            " WHERE grid_size = ? AND word_count = ? AND bucket = ? AND completion_time < ?",
+            (grid_size, word_count, bucket, best),
+        ).fetchone()[0]
+        return faster_buckets + faster_in_bucket + 1, best
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+class LeaderboardWriteError(RuntimeError):
+    """Raised by BufferedResultWriter.flush/close when a batch could not be written."""
+
+
+class BufferedResultWriter:
+    """
+    Queues submitted results and writes them from a background thread in
+    batches of up to 'batch_size', at least every 'flush_interval' seconds.
+
+    A batch that fails is retried 'retries' times. If it still fails, its
+    results are kept in 'failed_results' and the error is raised by the next
+    flush() or close(); the writer keeps running for later batches.
+    """
+
+    def __init__(self, leaderboard, batch_size=200, flush_interval=0.5, retries=2, retry_delay=0.5):
+        self.leaderboard = leaderboard
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.batches_written = 0
+        self.results_written = 0
+        self.failed_results = []
+        self._error = None
+        self._queue = queue.Queue()
+        self._stop = object()
+        self._thread = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, username, grid_size, word_count, completion_time):
+        self._queue.put(Result(username, grid_size, word_count, completion_time))
+
+    def flush(self):
+        """Blocks until everything submitted so far has been written (or has failed)."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._raise_error()
+
+    def close(self):
+        self._queue.put(self._stop)
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise LeaderboardWriteError(
+                f"{len(self.failed_results)} results could not be written to the leaderboard"
+            ) from error
+
+    def _write(self, batch):
+        for attempt in range(self.retries + 1):
+            try:
+                self.leaderboard.submit_many(batch)
+            except Exception as error:  # e.g. sqlite3.OperationalError: database is locked
+                if attempt == self.retries:
+                    print(f"Warning: could not write {len(batch)} leaderboard results: {error}")
+                    self.failed_results.extend(batch)
+                    self._error = error
+                    return
+                time.sleep(self.retry_delay)
+            else:
+                self.batches_written += 1
+                self.results_written += len(batch)
+                return
+
+    def _run(self):
+        batch = []
+        waiting = []
+        stopping = False
+        while not stopping:
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is self._stop:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiting.append(item)
+                    break
+                batch.append(item)
+
+            try:
+                if batch:
+                    self._write(batch)
+                    batch = []
+            finally:
+                # Nobody waiting on flush() may be left hanging, whatever happened
+                for event in waiting:
+                    event.set()
+                waiting = []
+
+        # The connection belongs to this thread, so it is closed here
+        self.leaderboard.close()
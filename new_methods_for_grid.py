@@ -1,81 +1,429 @@
 import random
 import re
 
-def place_words_on_grid(grid, words):
-    """Places words randomly on the grid."""
-    grid_size = len(grid)
-    words_positions = {}  # <-- new dictionary to store the placed coordinates
-
-    for word in words:
-        word = word.upper()
-        placed = False
-
-        for _ in range(100):
-            row = random.randint(0, grid_size - 1)
-            col = random.randint(0, grid_size - 1)
-            horizontal = random.choice([True, False])
-
-            # Try placing the word
-            if try_place_word(grid, word, row, col, horizontal):
-                # If successful, gather and store the coordinates for this word
-                coordinates = [] # Create an empty list to stor the coordinates
-                length = len(word)
-                if horizontal:
-                    for i in range(length):
-                        coordinates.append((row, col + i))
-                else:  # vertical
-                    for i in range(length):
-                        coordinates.append((row + i, col))
-
-                words_positions[word] = coordinates # add the word coordinates to each word
-                placed = True
-                break
-
-        if not placed:
+from word_grid import EMPTY_BYTE, EMPTY_CELL, WordGrid
+
+ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Every direction a word can run in, as (row step, column step).
+DIRECTIONS = [
+    (0, 1),    # left to right
+    (1, 0),    # top to bottom
+    (1, 1),    # diagonal down-right
+    (-1, 1),   # diagonal up-right
+    (0, -1),   # right to left
+    (-1, 0),   # bottom to top
+    (-1, -1),  # diagonal up-left
+    (1, -1),   # diagonal down-left
+]
+
+
+class PlacementStats:
+    """
+    Counters filled in by the placement functions while installed with
+    set_placement_stats(). An attempt is one slot considered for a word,
+    whether it is checked on its own, ruled out along with the rest of its
+    cell, covered by a whole-grid scan or re-checked while the search
+    narrows a word's slots; a rejection is an attempt where the word did
+    not fit.
+    """
+
+    def __init__(self):
+        self.words = 0
+        self.placed = 0
+        self.unplaced = 0
+        self.attempts = 0
+        self.rejections = 0
+        self.backtracks = 0
+        self.highlights = 0
+
+    @property
+    def attempts_per_word(self):
+        return self.attempts / self.words if self.words else 0.0
+
+    def as_dict(self):
+        return dict(vars(self), attempts_per_word=self.attempts_per_word)
+
+
+# Names the layouts create_puzzle produces for a given words list and seed.
+# Bump it whenever place_words_on_grid or fill_empty_cells starts giving a
+# different grid for the same input: puzzles stored as (words, seed) are
+# only rebuilt by the generator version that made them.
+GENERATOR_VERSION = 1
+
+# Slot checks the greedy pass of place_words_on_grid may spend per grid cell
+GREEDY_CHECKS_PER_CELL = 64
+# Default slot checks the backtracking search may spend per grid cell
+SEARCH_CHECKS_PER_CELL = 128
+
+# Opt-in instrumentation: None (the default) keeps the hot paths free of bookkeeping
+_placement_stats = None
+
+
+def set_placement_stats(stats):
+    """Installs a PlacementStats (or None to switch counting off) and returns the previous one."""
+    global _placement_stats
+    previous, _placement_stats = _placement_stats, stats
+    return previous
+
+
+def place_words_on_grid(grid, words, seed=None, max_checks=None):
+    """
+    Places every word on the grid, searching for a layout where they all fit.
+
+    A word longer than the grid can never fit, so it is rejected straight
+    away with ValueError.
+
+    Otherwise the words are first placed longest first, each in the first
+    free slot of a seeded order, which is enough for almost every puzzle.
+    This pass may check at most GREEDY_CHECKS_PER_CELL slots per grid cell,
+    so its cost stays proportional to the grid area. If any word is left
+    over, a backtracking search starts again from the empty grid, always
+    placing the word with the fewest remaining slots next. It gives up after
+    max_checks slot checks (SEARCH_CHECKS_PER_CELL per grid cell by
+    default). When no full layout is found, the greedy layout is kept and a
+    warning is printed for each word that did not fit.
+
+    The same words and seed always give the same grid. 'grid' is a WordGrid;
+    a list of lists of letters is also accepted and is updated in place.
+    """
+    board = grid if isinstance(grid, WordGrid) else WordGrid.from_rows(grid)
+    rng = random.Random(seed)
+
+    # Uppercase, drop blanks and duplicates, then longest words first
+    unique_words = list(dict.fromkeys(word.upper() for word in words if word))
+    ordered = sorted(unique_words, key=len, reverse=True)
+
+    cell_count = board.rows * board.cols
+    if ordered and len(ordered[0]) > max(board.rows, board.cols):
+        raise ValueError(f"The word '{ordered[0]}' is longer than the {board.rows}x{board.cols} grid")
+    if max_checks is None:
+        max_checks = SEARCH_CHECKS_PER_CELL * cell_count
+
+    # One shuffled order of the cells is shared by all words; each word
+    # starts reading it from its own random offset
+    cell_order = _CellOrder(cell_count, rng)
+
+    original = bytes(board.letters)
+    placements = {}
+    budget = _CheckBudget(GREEDY_CHECKS_PER_CELL * cell_count)
+    try:
+        for word in ordered:
+            slot = next(_valid_slots(board, word, cell_order, rng, budget), None)
+            if slot is not None:
+                _write_word(board, word, *slot)
+                placements[word] = slot
+    except _OutOfChecks:
+        pass
+
+    if len(placements) < len(ordered):
+        greedy = bytes(board.letters)
+        board.letters[:] = original
+        solved = _solve(board, ordered, cell_order, rng, max_checks)
+        if solved is None:
+            board.letters[:] = greedy
+        else:
+            placements = solved
+
+    words_positions = {}  # <-- dictionary to store the placed coordinates
+    for word in unique_words:
+        if word in placements:
+            words_positions[word] = word_coordinates(word, *placements[word])
+        else:
             print(f"Warning: Could not place the word '{word}' on the grid.")
 
+    stats = _placement_stats
+    if stats is not None:
+        stats.words += len(unique_words)
+        stats.placed += len(words_positions)
+        stats.unplaced += len(unique_words) - len(words_positions)
+
+    if board is not grid:
+        grid[:] = board.to_rows()
     return grid, words_positions # returning a tuple
 
+
+def create_puzzle(grid_size, words, seed=None):
+    """
+    Builds a finished puzzle: places the words and fills the rest of the grid
+    with random letters. The same words and seed always give the same puzzle.
+    Returns (grid, words_positions); raises ValueError for a word longer
+    than the grid, like place_words_on_grid.
+    """
+    grid, words_positions = place_words_on_grid(WordGrid(grid_size), words, seed=seed)
+    fill_empty_cells(grid, seed=seed)
+    return grid, words_positions
+
+
+class _OutOfChecks(Exception):
+    pass
+
+
+class _CheckBudget:
+    """Counts slot checks during a search and stops it once 'limit' is used up."""
+
+    __slots__ = ("left",)
+
+    def __init__(self, limit):
+        self.left = limit
+
+    def spend(self, checks):
+        self.left -= checks
+        if self.left < 0:
+            raise _OutOfChecks
+
+
+def _solve(grid, words, cell_order, rng, max_checks):
+    """
+    Backtracking search over every valid slot of every word.
+    Returns {word: (row, col, d_row, d_col)}, or None (with the grid left
+    unchanged) if there is no layout or the check budget ran out.
+    """
+    budget = _CheckBudget(max_checks)
+    snapshot = bytes(grid.letters)
+    try:
+        candidates = [(word, list(_valid_slots(grid, word, cell_order, rng, budget, lazy_cells=0)))
+                      for word in words]
+        found = _search(grid, candidates, budget)
+    except _OutOfChecks:
+        found = None
+    if found is None:
+        grid.letters[:] = snapshot
+    return found
+
+
+def _search(grid, candidates, budget):
+    """
+    Places the most constrained word (fewest slots left) in each of its slots
+    in turn, narrowing the other words' slots before going deeper.
+    'candidates' is a list of (word, slots), longest words first.
+    """
+    if not candidates:
+        return {}
+
+    # min() keeps the first of equal counts, so ties go to the longer word
+    pick = min(range(len(candidates)), key=lambda i: len(candidates[i][1]))
+    word, slots = candidates[pick]
+    rest = candidates[:pick] + candidates[pick + 1:]
+
+    for slot in slots:
+        written = _write_word(grid, word, *slot)
+        narrowed = []
+        for other, other_slots in rest:
+            if written:
+                budget.spend(len(other_slots))
+                checked = len(other_slots)
+                other_slots = [s for s in other_slots if _fits(grid, other, *s)]
+                if _placement_stats is not None:
+                    _placement_stats.attempts += checked
+                    _placement_stats.rejections += checked - len(other_slots)
+                if not other_slots:
+                    break
+            narrowed.append((other, other_slots))
+        else:
+            found = _search(grid, narrowed, budget)
+            if found is not None:
+                found[word] = slot
+                return found
+
+        _clear_cells(grid, written)
+        if _placement_stats is not None:
+            _placement_stats.backtracks += 1
+    return None
+
+
+class _CellOrder:
+    """A seeded shuffle of the cell indexes, plus each cell's position in it."""
+
+    __slots__ = ("cells", "rank")
+
+    def __init__(self, count, rng):
+        self.cells = list(range(count))
+        rng.shuffle(self.cells)
+        self.rank = [0] * count
+        for position, index in enumerate(self.cells):
+            self.rank[index] = position
+
+
+# How many cells of the shuffled order are tried one by one before the rest
+# of the grid is searched with regular expressions. Walking cells is quicker
+# on an emptyish grid, where a slot turns up almost at once; the regex scan
+# is quicker once the grid is crowded and most cells have to be looked at.
+_LAZY_CELLS = 256
+
+
+def _valid_slots(grid, word, cell_order, rng, budget=None, lazy_cells=_LAZY_CELLS):
+    """
+    Yields every (row, col, d_row, d_col) where the word fits, in a seeded
+    order. Each slot checked is charged to 'budget' when one is given.
+    """
+    rows, cols = grid.rows, grid.cols
+    letters = grid.letters
+    cells, rank = cell_order.cells, cell_order.rank
+    total = len(cells)
+    if not total:
+        return
+
+    directions = DIRECTIONS[:]
+    rng.shuffle(directions)
+    offset = rng.randrange(total)
+    first = ord(word[0])
+    final = ord(word[-1])
+    last = len(word) - 1
+    stats = _placement_stats
+
+    lazy_cells = min(total, lazy_cells)
+    for step in range(lazy_cells):
+        index = cells[(offset + step) % total]
+        if letters[index] not in (EMPTY_BYTE, first):
+            if stats is not None:
+                stats.attempts += len(directions)
+                stats.rejections += len(directions)
+            continue
+        row, col = divmod(index, cols)
+        for d_row, d_col in directions:
+            if budget is not None:
+                budget.spend(1)
+            if stats is not None:
+                stats.attempts += 1
+            end_row = row + d_row * last
+            end_col = col + d_col * last
+            # Bounds and the last cell are cheap to test before the whole path
+            if 0 <= end_row < rows and 0 <= end_col < cols and \
+                    letters[end_row * cols + end_col] in (EMPTY_BYTE, final) and \
+                    _fits(grid, word, row, col, d_row, d_col):
+                yield row, col, d_row, d_col
+            elif stats is not None:
+                stats.rejections += 1
+
+    if lazy_cells == total:
+        return
+
+    # Every remaining slot at once, sorted into the same order as above.
+    # The scan reads every cell, so it is charged one check per cell.
+    direction_order = {direction: i for i, direction in enumerate(directions)}
+    found = []
+    for slot in _matching_slots(grid, word):
+        row, col, d_row, d_col = slot
+        step = (rank[row * cols + col] - offset) % total
+        if step >= lazy_cells:
+            found.append((step * 8 + direction_order[d_row, d_col], slot))
+    if budget is not None:
+        budget.spend(total + len(found))
+    if stats is not None:
+        covered = (total - lazy_cells) * len(directions)
+        stats.attempts += covered
+        stats.rejections += covered - len(found)
+    found.sort()
+    for _, slot in found:
+        yield slot
+
+
+def _slot_pattern(word):
+    """Regex matching, at any offset, a run of cells the word fits into."""
+    empty = re.escape(EMPTY_CELL.encode("ascii"))
+    cells = b"".join(b"[" + empty + re.escape(letter.encode("ascii")) + b"]" for letter in word)
+    return re.compile(b"(?=" + cells + b")")
+
+
+def _matching_slots(grid, word):
+    """Yields every slot the word fits in, scanning each grid line both ways with a regex."""
+    forward = _slot_pattern(word)
+    backward = _slot_pattern(word[::-1])
+    length = len(word)
+    for row, col, d_row, d_col, line in grid.lines():
+        if len(line) < length:
+            continue
+        for match in forward.finditer(line):
+            i = match.start()
+            yield row + d_row * i, col + d_col * i, d_row, d_col
+        for match in backward.finditer(line):
+            i = match.start() + length - 1
+            yield row + d_row * i, col + d_col * i, -d_row, -d_col
+
+
+def _fits(grid, word, row, col, d_row, d_col):
+    """True if every cell on the path is empty or already holds the right letter."""
+    path = grid.path(row, col, d_row, d_col, len(word))
+    return all(cell == EMPTY_BYTE or cell == ord(letter) for cell, letter in zip(path, word))
+
+
+def _write_word(grid, word, row, col, d_row, d_col):
+    """Writes the word into the grid and returns the buffer indexes that were empty before."""
+    letters = grid.letters
+    start = grid.index(row, col)
+    step = d_row * grid.cols + d_col
+    written = []
+    for i, letter in enumerate(word):
+        index = start + step * i
+        if letters[index] == EMPTY_BYTE:
+            letters[index] = ord(letter)
+            written.append(index)
+    return written
+
+
+def _clear_cells(grid, indexes):
+    for index in indexes:
+        grid.letters[index] = EMPTY_BYTE
+
+
+def fill_empty_cells(grid, seed=None):
+    """Replaces every empty cell with a random letter A-Z."""
+    rng = random.Random(seed)
+    letters = grid.letters
+    for index, letter in enumerate(letters):
+        if letter == EMPTY_BYTE:
+            letters[index] = rng.choice(ALPHABET)
+    return grid
+
+
+def word_coordinates(word, row, col, d_row, d_col):
+    """Returns the list of (row, col) cells covered by a placed word."""
+    return [(row + d_row * i, col + d_col * i) for i in range(len(word))]
+
+
 def try_place_word(grid, word, row, col, horizontal):
     """
-    Attempts to place a word on the grid starting at (row, col).
+    Attempts to place a word on the WordGrid starting at (row, col).
+    'horizontal' is True/False for the two original directions, or a
+    (d_row, d_col) pair from DIRECTIONS.
     Returns True if successful, False otherwise.
     """
-    length = len(word)
-    if horizontal:
-        if col + length > len(grid[0]):  # Check horizontal bounds
-            return False
-        if any(grid[row][col + i] not in ("*", word[i]) for i in range(length)):
-            return False
-        for i in range(length):
-            grid[row][col + i] = word[i]
+    if horizontal is True:
+        d_row, d_col = 0, 1
+    elif horizontal is False:
+        d_row, d_col = 1, 0
     else:
-        if row + length > len(grid):  # Check vertical bounds
-            return False
-        if any(grid[row + i][col] not in ("*", word[i]) for i in range(length)):
-            return False
-        for i in range(length):
-            grid[row + i][col] = word[i]
+        d_row, d_col = horizontal
+
+    stats = _placement_stats
+    if stats is not None:
+        stats.attempts += 1
+
+    last = len(word) - 1
+    end_row, end_col = row + d_row * last, col + d_col * last
+    if not (0 <= row < grid.rows and 0 <= end_row < grid.rows) or \
+            not (0 <= col < grid.cols and 0 <= end_col < grid.cols) or \
+            not _fits(grid, word, row, col, d_row, d_col):  # Check bounds, then letters
+        if stats is not None:
+            stats.rejections += 1
+        return False
+    _write_word(grid, word, row, col, d_row, d_col)
     return True
 
 
 def update_game_grid(grid, word, colours_counter, words_positions):
+    """
+    Highlights a found word by writing 'colours_counter' into the grid's
+    colour mask. The letters themselves are left untouched.
+    """
     # 'word' is uppercase in the puzzle
     word = word.upper()
 
     # Retrieve the list of coordinates from the dictionary
     coordinates = words_positions.get(word, [])
-
-    # Color each character at those coordinates
-    for (r, c) in coordinates:
-        original_char = word_search_grid[r][c]
-        # Remove any existing color codes if you prefer, or just color over it
-        # For safety, remove ANSI codes so we don't get nested codes
-        ansi_escape = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
-        plain_char = ansi_escape.sub('', original_char)
-
-        grid[r][c] = (COLOURS_LIST[colours_counter]
-                                  + plain_char
-                                  + Style.RESET_ALL)
+    grid.highlight(coordinates, colours_counter)
+    if _placement_stats is not None:
+        _placement_stats.highlights += 1
 
     return grid
@@ -0,0 +1,303 @@
+"""
+Compact binary format for puzzles.
+
+A record is one of two kinds, both starting with the same header:
+
+    magic "WOP", version (u8), kind (u8), rows (u16), cols (u16)
+
+FULL records then hold the word count (u16), the letters packed at 5 bits
+per cell, and one (start cell u32, direction u8, length u16) entry per
+word. The words themselves are read back off the grid.
+
+SEED records hold the seed (u64), the GENERATOR_VERSION that made the
+puzzle (u16), the word count (u16), each word's length (u16) and the words'
+letters packed at 5 bits each. Loading one rebuilds the puzzle with
+create_puzzle, which is deterministic for a given seed, and is refused if
+the generator version differs. Version 1 SEED records had no generator
+version and cannot be loaded; version 1 FULL records are the same as now.
+
+An archive is a file of records followed by a footer: one u64 offset per
+record, the record count (u64) and the magic "WOPA". PuzzleArchive maps the
+file and hands out PuzzleViews over slices of it without copying. Views
+keep the mapping alive: closing the archive closes the file, and the memory
+is unmapped once the last view taken from it is gone.
+
+All integers are little-endian.
+"""
+import mmap
+import struct
+
+from new_methods_for_grid import DIRECTIONS, GENERATOR_VERSION, create_puzzle, word_coordinates
+from word_grid import EMPTY_CELL, WordGrid
+
+VERSION = 2
+FULL = 0
+SEED = 1
+
+_HEADER = struct.Struct("<3sBBHH")
+_FULL_INFO = struct.Struct("<H")
+_SEED_INFO = struct.Struct("<QHH")
+_WORD = struct.Struct("<IBH")
+_FOOTER = struct.Struct("<Q4s")
+
+MAGIC = b"WOP"
+ARCHIVE_MAGIC = b"WOPA"
+
+# Letters A-Z are codes 0-25 and an empty cell is 26
+_SYMBOLS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ" + EMPTY_CELL.encode("ascii")
+_TO_CODE = bytes(_SYMBOLS.index(i) if i in _SYMBOLS else 255 for i in range(256))
+_FROM_CODE = bytes(_SYMBOLS[i] if i < len(_SYMBOLS) else ord("?") for i in range(256))
+
+
+class PuzzleFormatError(ValueError):
+    pass
+
+
+def pack_letters(letters):
+    """Packs ASCII letters (bytes) into 5 bits each, eight letters to every five bytes."""
+    codes = bytes(letters).translate(_TO_CODE)
+    if 255 in codes:
+        raise PuzzleFormatError("Only the letters A-Z and empty cells can be stored")
+    codes += bytes(-len(codes) % 8)
+    packed = bytearray()
+    for i in range(0, len(codes), 8):
+        c = codes[i:i + 8]
+        value = (c[0] << 35 | c[1] << 30 | c[2] << 25 | c[3] << 20
+                 | c[4] << 15 | c[5] << 10 | c[6] << 5 | c[7])
+        packed += value.to_bytes(5, "big")
+    return bytes(packed[:_packed_size(len(letters))])
+
+
+def unpack_letters(packed, count):
+    """Inverse of pack_letters: returns 'count' ASCII letters."""
+    data = bytes(packed[:_packed_size(count)]) + bytes(5)
+    codes = bytearray()
+    for i in range(0, _packed_size(count), 5):
+        value = int.from_bytes(data[i:i + 5], "big")
+        codes += bytes((value >> shift) & 31 for shift in (35, 30, 25, 20, 15, 10, 5, 0))
+    return bytes(codes[:count]).translate(_FROM_CODE)
+
+
+def _packed_size(count):
+    return (count * 5 + 7) // 8
+
+
+def _letter_at(packed, index):
+    """Reads one 5-bit code straight out of the packed buffer."""
+    bit = index * 5
+    byte = bit // 8
+    pair = packed[byte] << 8 | (packed[byte + 1] if byte + 1 < len(packed) else 0)
+    return _SYMBOLS[(pair >> (11 - bit % 8)) & 31]
+
+
+def dumps(grid, words_positions):
+    """Encodes a WordGrid and its words_positions as a FULL record."""
+    words = []
+    for word, cells in words_positions.items():
+        (row, col) = cells[0]
+        direction = 0
+        if len(cells) > 1:
+            direction = DIRECTIONS.index((cells[1][0] - row, cells[1][1] - col))
+        words.append(_WORD.pack(grid.index(row, col), direction, len(word)))
+
+    return b"".join([
+        _HEADER.pack(MAGIC, VERSION, FULL, grid.rows, grid.cols),
+        _FULL_INFO.pack(len(words)),
+        pack_letters(grid.letters),
+        *words,
+    ])
+
+
+def dumps_seed(grid_size, words, seed):
+    """Encodes only what create_puzzle needs to rebuild a puzzle: a SEED record."""
+    words = [word.upper() for word in words]
+    return b"".join([
+        _HEADER.pack(MAGIC, VERSION, SEED, grid_size, grid_size),
+        _SEED_INFO.pack(seed, GENERATOR_VERSION, len(words)),
+        struct.pack(f"<{len(words)}H", *map(len, words)),
+        pack_letters("".join(words).encode("ascii")),
+    ])
+
+
+def loads(buffer):
+    """Decodes a record of either kind into (grid, words_positions)."""
+    return PuzzleView(buffer).load()
+
+
+class PuzzleView:
+    """
+    Read-only view of one encoded puzzle. Only the header is parsed up
+    front; the letters stay packed until they are asked for.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = memoryview(buffer)
+        if len(self.buffer) < _HEADER.size:
+            raise PuzzleFormatError("Record is too short")
+        magic, version, self.kind, self.rows, self.cols = _HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise PuzzleFormatError("Not a puzzle record")
+        if version not in (1, VERSION):
+            raise PuzzleFormatError(f"Unsupported puzzle format version {version}")
+        if self.kind not in (FULL, SEED):
+            raise PuzzleFormatError(f"Unknown puzzle kind {self.kind}")
+        if self.kind == SEED and version < 2:
+            raise PuzzleFormatError("Version 1 seed records do not say which generator made them")
+
+        offset = _HEADER.size
+        if self.kind == FULL:
+            self._need(offset + _FULL_INFO.size)
+            (self.word_count,) = _FULL_INFO.unpack_from(self.buffer, offset)
+            self.seed = self.generator = None
+            offset += _FULL_INFO.size
+            self._need(offset + _packed_size(self.rows * self.cols) + _WORD.size * self.word_count)
+        else:
+            self._need(offset + _SEED_INFO.size)
+            self.seed, self.generator, self.word_count = _SEED_INFO.unpack_from(self.buffer, offset)
+            offset += _SEED_INFO.size
+            self._need(offset + 2 * self.word_count)
+        self._body = offset
+
+    def _need(self, size):
+        if len(self.buffer) < size:
+            raise PuzzleFormatError(f"Record is truncated: {len(self.buffer)} of {size} bytes")
+
+    def _letters_buffer(self):
+        return self.buffer[self._body:self._body + _packed_size(self.rows * self.cols)]
+
+    def letter_at(self, row, col):
+        """One letter of a FULL record, read without unpacking the grid."""
+        if self.kind != FULL:
+            raise PuzzleFormatError("Seed records have no stored letters")
+        return chr(_letter_at(self._letters_buffer(), row * self.cols + col))
+
+    def words(self):
+        """The puzzle's words, in stored order."""
+        if self.kind == SEED:
+            lengths = struct.unpack_from(f"<{self.word_count}H", self.buffer, self._body)
+            start = self._body + 2 * self.word_count
+            self._need(start + _packed_size(sum(lengths)))
+            letters = unpack_letters(self.buffer[start:], sum(lengths)).decode("ascii")
+            words, position = [], 0
+            for length in lengths:
+                words.append(letters[position:position + length])
+                position += length
+            return words
+
+        packed = self._letters_buffer()
+        words = []
+        for start, direction, length in self._placements():
+            row, col = divmod(start, self.cols)
+            cells = word_coordinates("?" * length, row, col, *DIRECTIONS[direction])
+            words.append("".join(chr(_letter_at(packed, r * self.cols + c)) for r, c in cells))
+        return words
+
+    def _placements(self):
+        offset = self._body + _packed_size(self.rows * self.cols)
+        placements = list(_WORD.iter_unpack(self.buffer[offset:offset + _WORD.size * self.word_count]))
+        for start, direction, length in placements:
+            if direction >= len(DIRECTIONS) or not self._on_grid(start, DIRECTIONS[direction], length):
+                raise PuzzleFormatError("Word placement lies outside the grid")
+        return placements
+
+    def _on_grid(self, start, direction, length):
+        if length < 1 or start >= self.rows * self.cols:
+            return False
+        row, col = divmod(start, self.cols)
+        end_row = row + direction[0] * (length - 1)
+        end_col = col + direction[1] * (length - 1)
+        return 0 <= end_row < self.rows and 0 <= end_col < self.cols
+
+    def load(self):
+        """Returns (grid, words_positions), regenerating SEED records."""
+        if self.kind == SEED:
+            if self.generator != GENERATOR_VERSION:
+                raise PuzzleFormatError(f"Seed record was made by generator version {self.generator},"
+                                        f" this is version {GENERATOR_VERSION}")
+            return create_puzzle(self.rows, self.words(), seed=self.seed)
+
+        grid = WordGrid(self.rows, self.cols)
+        grid.letters[:] = unpack_letters(self._letters_buffer(), self.rows * self.cols)
+        words_positions = {}
+        for word, (start, direction, length) in zip(self.words(), self._placements()):
+            row, col = divmod(start, self.cols)
+            words_positions[word] = word_coordinates(word, row, col, *DIRECTIONS[direction])
+        return grid, words_positions
+
+
+def write_archive(path, records):
+    """Writes encoded records (from dumps/dumps_seed) to an archive file. Returns the count."""
+    offsets = []
+    with open(path, "wb") as f:
+        position = 0
+        for record in records:
+            offsets.append(position)
+            f.write(record)
+            position += len(record)
+        offsets.append(position)
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        f.write(_FOOTER.pack(len(offsets) - 1, ARCHIVE_MAGIC))
+    return len(offsets) - 1
+
+
+class PuzzleArchive:
+    """
+    Memory-mapped archive of puzzles. archive[i] is a PuzzleView over the
+    i-th record; nothing else in the file is read.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise PuzzleFormatError("Archive file is empty") from None
+        self._data = memoryview(self._map)
+        if len(self._data) < _FOOTER.size:
+            self.close()
+            raise PuzzleFormatError("Archive file is too short")
+
+        count, magic = _FOOTER.unpack_from(self._data, len(self._data) - _FOOTER.size)
+        if magic != ARCHIVE_MAGIC:
+            self.close()
+            raise PuzzleFormatError("Not a puzzle archive")
+        self._count = count
+        self._table = len(self._data) - _FOOTER.size - 8 * (count + 1)
+        if self._table < 0:
+            self.close()
+            raise PuzzleFormatError("Archive offset table is truncated")
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("puzzle index out of range")
+        start, end = struct.unpack_from("<2Q", self._data, self._table + 8 * index)
+        if not start <= end <= self._table:
+            raise PuzzleFormatError(f"Bad offsets for puzzle {index}")
+        return PuzzleView(self._data[start:end])
+
+    def close(self):
+        """
+        Closes the file. The mapping is released now if no views are left,
+        otherwise when the last one is garbage collected.
+        """
+        if self._map is None:
+            return
+        self._data.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # views still point into it; dropping our reference defers the unmap
+        self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,174 @@
+import random
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from article_cache import fetch_article
+from new_methods_for_grid import GENERATOR_VERSION, create_puzzle
+from word_extractor import extract_words
+
+Puzzle = namedtuple("Puzzle", ["seed", "grid_size", "word_count", "topic", "words", "grid", "words_positions",
+                               "generator"])
+
+
+def words_for_topic(topic, grid_size, word_count):
+    """Default word source: the best words of the Wikipedia article named 'topic'."""
+    article = fetch_article(topic)
+    if article is None:
+        raise LookupError(f"No Wikipedia article called '{topic}'")
+    return extract_words(article.text, grid_size, word_count)
+
+
+def generate_puzzle(grid_size, word_count, topic, seed, word_source=words_for_topic):
+    """Worker function: builds one puzzle. Runs in a pool process, so it must stay picklable."""
+    words = word_source(topic, grid_size, word_count)
+    grid, words_positions = create_puzzle(grid_size, words, seed=seed)
+    return Puzzle(seed, grid_size, word_count, topic, words, grid, words_positions, GENERATOR_VERSION)
+
+
+def regenerate_puzzle(puzzle):
+    """
+    Rebuilds a puzzle from its stored words and seed, without fetching the
+    article again. Raises ValueError if it was made by another generator
+    version, which would lay the same words and seed out differently.
+    """
+    if puzzle.generator != GENERATOR_VERSION:
+        raise ValueError(f"Puzzle was made by generator version {puzzle.generator},"
+                         f" this is version {GENERATOR_VERSION}")
+    grid, words_positions = create_puzzle(puzzle.grid_size, puzzle.words, seed=puzzle.seed)
+    return puzzle._replace(grid=grid, words_positions=words_positions)
+
+
+# Seconds of completions that metrics() averages the generation rate over
+_RATE_WINDOW = 60
+
+
+class _Bucket:
+    __slots__ = ("ready", "in_flight", "generated", "served", "misses", "failures", "last_error",
+                 "finished_at", "created_at")
+
+    def __init__(self):
+        self.ready = deque()
+        self.in_flight = 0
+        self.generated = 0
+        self.served = 0
+        self.misses = 0
+        self.failures = 0
+        self.last_error = None
+        self.finished_at = deque(maxlen=256)  # completion times, for the generation rate
+        self.created_at = time.monotonic()
+
+
+class PuzzlePool:
+    """
+    Keeps ready-made puzzles for each (grid_size, word_count, topic) bucket.
+
+    Puzzles are built in a ProcessPoolExecutor. Whenever a bucket's ready and
+    in-flight puzzles drop below 'refill_threshold', it is topped back up to
+    'target_depth'. get() pops from a deque; if the bucket is empty the
+    puzzle is built in the caller's process instead and counted as a miss.
+    Jobs that fail, or can't be submitted because the executor is closed or
+    broken, are counted in the bucket's 'failures'.
+    """
+
+    def __init__(self, max_workers=None, refill_threshold=2, target_depth=6,
+                 word_source=words_for_topic, executor=None):
+        self.refill_threshold = refill_threshold
+        self.target_depth = target_depth
+        self.word_source = word_source
+        self._executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._seeds = random.SystemRandom()
+
+    def warm(self, grid_size, word_count, topic):
+        """Starts filling a bucket before anyone asks for it."""
+        with self._lock:
+            self._buckets.setdefault((grid_size, word_count, topic), _Bucket())
+        self._refill((grid_size, word_count, topic))
+
+    def get(self, grid_size, word_count, topic):
+        key = (grid_size, word_count, topic)
+        with self._lock:
+            bucket = self._buckets.setdefault(key, _Bucket())
+            puzzle = bucket.ready.popleft() if bucket.ready else None
+            if puzzle is None:
+                bucket.misses += 1
+            else:
+                bucket.served += 1
+        self._refill(key)
+
+        if puzzle is None:
+            puzzle = generate_puzzle(grid_size, word_count, topic, self._new_seed(), self.word_source)
+        return puzzle
+
+    def _new_seed(self):
+        return self._seeds.getrandbits(63)
+
+    def _refill(self, key):
+        with self._lock:
+            bucket = self._buckets[key]
+            queued = len(bucket.ready) + bucket.in_flight
+            if queued >= self.refill_threshold:
+                return
+            wanted = self.target_depth - queued
+            # Reserved now so that concurrent refills don't both top up the bucket
+            bucket.in_flight += wanted
+
+        for submitted in range(wanted):
+            try:
+                future = self._executor.submit(generate_puzzle, *key, self._new_seed(), self.word_source)
+            except Exception as error:  # closed pool, or a BrokenProcessPool
+                with self._lock:
+                    bucket.in_flight -= wanted - submitted
+                    bucket.failures += 1
+                    bucket.last_error = repr(error)
+                return
+            future.add_done_callback(lambda done, key=key: self._finished(key, done))
+
+    def _finished(self, key, future):
+        with self._lock:
+            bucket = self._buckets[key]
+            bucket.in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                bucket.failures += 1
+                bucket.last_error = repr(future.exception())
+                return
+            bucket.ready.append(future.result())
+            bucket.generated += 1
+            bucket.finished_at.append(time.monotonic())
+
+    def metrics(self):
+        """
+        Per-bucket queue depth, in-flight jobs, counters and generation rate
+        over the last minute (or since the bucket was created, if sooner).
+        """
+        now = time.monotonic()
+        report = {}
+        with self._lock:
+            for key, bucket in self._buckets.items():
+                recent = [t for t in bucket.finished_at if now - t <= _RATE_WINDOW]
+                span = min(_RATE_WINDOW, now - bucket.created_at)
+                report[key] = {
+                    "depth": len(bucket.ready),
+                    "in_flight": bucket.in_flight,
+                    "generated": bucket.generated,
+                    "served": bucket.served,
+                    "misses": bucket.misses,
+                    "failures": bucket.failures,
+                    "last_error": bucket.last_error,
+                    "puzzles_per_second": len(recent) / span if span > 0 else 0.0,
+                }
+        return report
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
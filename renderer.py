@@ -0,0 +1,140 @@
+import shutil
+import sys
+import time
+from collections import deque
+
+from colorama import Fore, Style
+
+# Colours used for found words, in the order they are handed out
+COLOURS_LIST = [Fore.RED, Fore.GREEN, Fore.YELLOW, Fore.BLUE, Fore.MAGENTA, Fore.CYAN]
+
+CLEAR_SCREEN = "\x1b[2J"
+
+
+def move_cursor(row, col):
+    """Escape sequence that moves the cursor to a 1-based (row, col)."""
+    return f"\x1b[{row};{col}H"
+
+
+class TerminalRenderer:
+    """
+    Draws a WordGrid to the terminal, rewriting only the cells that changed
+    since the last frame.
+
+    The first frame, a new grid shape and a terminal resize all trigger a
+    full redraw. Every frame is sent to the stream in a single write, and
+    the time spent on each one is kept in 'frame_times'.
+    """
+
+    def __init__(self, stream=None, palette=COLOURS_LIST, top=1, left=1,
+                 cell_width=2, history=1000, terminal_size=shutil.get_terminal_size):
+        self.stream = stream if stream is not None else sys.stdout
+        self.palette = palette
+        self.top = top
+        self.left = left
+        self.cell_width = cell_width
+        self.terminal_size = terminal_size
+        self.frame_times = deque(maxlen=history)  # (seconds, cells written)
+        self._letters = None
+        self._colours = None
+        self._shape = None
+        self._size = None
+
+    def draw(self, grid, changed=None):
+        """
+        Draws the grid and returns the number of cells written.
+
+        'changed' can list the (row, col) cells the caller knows were
+        touched (for example the coordinates of a found word); only those
+        are compared against the last frame. Without it every row is
+        compared, which is still cheap because unchanged rows are skipped
+        with a single bytes comparison.
+
+        The last frame is kept as what is actually on screen: only the
+        cells that were drawn are updated in it, so a change outside the
+        hint is still picked up by a later draw.
+        """
+        started = time.perf_counter()
+        size = tuple(self.terminal_size())
+        shape = (grid.rows, grid.cols)
+
+        if self._letters is None or shape != self._shape or size != self._size:
+            output = self._full_frame(grid)
+            written = grid.rows * grid.cols
+            self._letters = bytearray(grid.letters)
+            self._colours = bytearray(grid.colours)
+        else:
+            indexes = self._changed_indexes(grid, changed)
+            output = [self._cell(grid, index) for index in indexes]
+            written = len(indexes)
+            letters, colours = grid.letters, grid.colours
+            for index in indexes:
+                self._letters[index] = letters[index]
+                self._colours[index] = colours[index]
+
+        # Leave the cursor under the grid so prompts do not overwrite it
+        output.append(move_cursor(self.top + grid.rows, 1))
+        self.stream.write("".join(output))
+        self.stream.flush()
+
+        self._shape = shape
+        self._size = size
+        self.frame_times.append((time.perf_counter() - started, written))
+        return written
+
+    def invalidate(self):
+        """Forces the next draw to repaint the whole grid."""
+        self._letters = None
+
+    def _full_frame(self, grid):
+        output = [CLEAR_SCREEN]
+        for r in range(grid.rows):
+            output.append(move_cursor(self.top + r, self.left))
+            start = r * grid.cols
+            output.extend(self._styled(grid, i) + " " * (self.cell_width - 1)
+                          for i in range(start, start + grid.cols))
+        return output
+
+    def _changed_indexes(self, grid, changed):
+        letters, colours = grid.letters, grid.colours
+        old_letters, old_colours = self._letters, self._colours
+        if changed is not None:
+            candidates = (grid.index(r, c) for r, c in changed)
+            return [i for i in candidates
+                    if letters[i] != old_letters[i] or colours[i] != old_colours[i]]
+
+        indexes = []
+        cols = grid.cols
+        for r in range(grid.rows):
+            start, stop = r * cols, (r + 1) * cols
+            if letters[start:stop] == old_letters[start:stop] and \
+                    colours[start:stop] == old_colours[start:stop]:
+                continue
+            indexes.extend(i for i in range(start, stop)
+                           if letters[i] != old_letters[i] or colours[i] != old_colours[i])
+        return indexes
+
+    def _cell(self, grid, index):
+        row, col = divmod(index, grid.cols)
+        return move_cursor(self.top + row, self.left + col * self.cell_width) + self._styled(grid, index)
+
+    def _styled(self, grid, index):
+        letter = chr(grid.letters[index])
+        colour = grid.colours[index]
+        if colour and self.palette:
+            return self.palette[(colour - 1) % len(self.palette)] + letter + Style.RESET_ALL
+        return letter
+
+    def frame_stats(self):
+        """Summary of the recorded frames: count, mean/max/last seconds and cells written."""
+        if not self.frame_times:
+            return {"frames": 0, "mean_seconds": 0.0, "max_seconds": 0.0,
+                    "last_seconds": 0.0, "last_cells": 0}
+        seconds = [s for s, _ in self.frame_times]
+        return {
+            "frames": len(seconds),
+            "mean_seconds": sum(seconds) / len(seconds),
+            "max_seconds": max(seconds),
+            "last_seconds": seconds[-1],
+            "last_cells": self.frame_times[-1][1],
+        }
@@ -0,0 +1,235 @@
+import random
+from array import array
+from collections import defaultdict, deque
+
+from new_methods_for_grid import ALPHABET, word_coordinates
+
+_NO_MATCHES = ()
+
+# Transition table columns: one per letter A-Z, plus one for anything else
+# (an empty cell), which always leads back to the root
+_COLUMNS = 27
+_CODES = bytes(ALPHABET.index(i) if i in ALPHABET else 26 for i in range(256))
+
+
+class WordFinder:
+    """
+    Aho-Corasick automaton over a word list, used to find every word hidden
+    in a WordGrid.
+
+    Each word is added forwards and backwards, so one pass along each row,
+    column and diagonal finds words running in all 8 directions.
+
+    Once built, the trie is flattened into one array of transitions with a
+    row of _COLUMNS entries per state. Entries hold the target row's offset,
+    so a scan step is a single array index. Transitions that go through
+    failure links are worked out the first time they are needed and then
+    stored in the array. States that complete a word are numbered last, so
+    the scan spots a match with one comparison.
+    """
+
+    def __init__(self, words, min_length=2):
+        self.words = []
+        goto = [{}]          # state -> {letter code: next state}
+        matches = [_NO_MATCHES]  # state -> ((word id, reversed), ...)
+
+        seen = set()
+        for word in words:
+            word = word.upper()
+            if len(word) < min_length or word in seen or not _is_plain(word):
+                continue
+            seen.add(word)
+            word_id = len(self.words)
+            self.words.append(word)
+            codes = word.encode("ascii").translate(_CODES)
+            _add(goto, matches, codes, (word_id, False))
+            if codes[::-1] != codes:
+                _add(goto, matches, codes[::-1], (word_id, True))
+
+        fail = _link(goto, matches)
+        self._compile(goto, fail, matches)
+
+    def __len__(self):
+        return len(self.words)
+
+    def _compile(self, goto, fail, matches):
+        """Renumbers the states (matching ones last) and flattens the trie into arrays."""
+        order = [state for state in range(len(goto)) if not matches[state]]
+        self._first_match = len(order) * _COLUMNS
+        order += [state for state in range(len(goto)) if matches[state]]
+        offset = [0] * len(goto)
+        for position, state in enumerate(order):
+            offset[state] = position * _COLUMNS
+
+        table = array("i", [-1]) * (len(goto) * _COLUMNS)
+        for state, edges in enumerate(goto):
+            row = offset[state]
+            for code, child in edges.items():
+                table[row + code] = offset[child]
+        for code in range(_COLUMNS):
+            if table[code] < 0:
+                table[code] = 0
+
+        self._table = table
+        self._fail = array("i", (offset[fail[state]] for state in order))
+
+        # Nearly every scan step passes through the states one or two letters
+        # deep, so their transitions are filled in now rather than mid-scan
+        shallow = list(goto[0].values())
+        shallow += [child for state in shallow for child in goto[state].values()]
+        for state in shallow:
+            for code in range(_COLUMNS):
+                self._resolve(offset[state], code)
+        # (word, letters before the last one, reversed) for every word a state completes
+        self._matches = {
+            offset[state]: tuple((self.words[word_id], len(self.words[word_id]) - 1, backwards)
+                                 for word_id, backwards in matches[state])
+            for state in range(len(goto)) if matches[state]
+        }
+
+    def table_bytes(self):
+        """Size of the transition table in bytes."""
+        return len(self._table) * self._table.itemsize
+
+    def _resolve(self, row, code):
+        """Works out a transition that is not a trie edge, via the failure link, and stores it."""
+        target = self._table[row + code]
+        if target < 0:
+            target = self._resolve(self._fail[row // _COLUMNS], code)
+            self._table[row + code] = target
+        return target
+
+    def scan(self, grid):
+        """
+        Yields (word, row, col, d_row, d_col) for every occurrence of a word
+        in the grid, where (row, col) is the first letter and (d_row, d_col)
+        the direction it reads in. Occurrences come grouped by word.
+        """
+        for word, occurrences in self.find_all(grid).items():
+            for occurrence in occurrences:
+                yield (word, *occurrence)
+
+    def find_all(self, grid):
+        """
+        Returns {word: [(row, col, d_row, d_col), ...]} with one entry per
+        occurrence, so a guess can be checked with one dict lookup. Use
+        word_coordinates(word, *occurrence) for the cells of an occurrence.
+        """
+        table, matches, first_match = self._table, self._matches, self._first_match
+        resolve = self._resolve
+        found = defaultdict(list)
+        for row, col, d_row, d_col, line in grid.lines():
+            state = 0
+            for i, code in enumerate(line.translate(_CODES)):
+                next_state = table[state + code]
+                if next_state < 0:
+                    next_state = resolve(state, code)
+                state = next_state
+                if state < first_match:
+                    continue
+                for word, back, backwards in matches[state]:
+                    if backwards:
+                        # Read right to left: the word starts at the match end
+                        found[word].append((row + d_row * i, col + d_col * i, -d_row, -d_col))
+                    else:
+                        start = i - back
+                        found[word].append((row + d_row * start, col + d_col * start, d_row, d_col))
+        return dict(found)
+
+
+def _add(goto, matches, codes, match):
+    state = 0
+    for code in codes:
+        next_state = goto[state].get(code)
+        if next_state is None:
+            next_state = len(goto)
+            goto[state][code] = next_state
+            goto.append({})
+            matches.append(_NO_MATCHES)
+        state = next_state
+    matches[state] += (match,)
+
+
+def _link(goto, matches):
+    """
+    Breadth-first pass that returns the failure link of every state and
+    extends each state's matches with those of its failure state.
+    """
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for code, child in goto[state].items():
+            queue.append(child)
+            link = fail[state]
+            while link and code not in goto[link]:
+                link = fail[link]
+            link = goto[link].get(code, 0)
+            fail[child] = link if link != child else 0
+            if matches[fail[child]]:
+                matches[child] += matches[fail[child]]
+    return fail
+
+
+def _is_plain(word):
+    return word.isascii() and word.isalpha()
+
+
+def ambiguous_words(found, words_positions):
+    """
+    Splits the result of WordFinder.find_all into target words that appear
+    more than once and extra words that were not placed on purpose.
+
+    An occurrence that covers exactly the cells of a placed word is that
+    word, not a second copy or an extra word: TAB placed on the grid is also
+    found as BAT read backwards, and neither counts against BAT or TAB.
+    """
+    placed = {frozenset(cells) for cells in words_positions.values()}
+    repeated = {}
+    extra = {}
+    for word, occurrences in found.items():
+        stray = [occurrence for occurrence in occurrences
+                 if frozenset(word_coordinates(word, *occurrence)) not in placed]
+        if word in words_positions:
+            if stray:
+                repeated[word] = stray
+        elif stray:
+            extra[word] = stray
+    return repeated, extra
+
+
+def repair_puzzle(grid, words_positions, finder, seed=None, allow_extra_words=True, max_rounds=20):
+    """
+    Re-rolls filler letters until no target word appears twice (and, if
+    allow_extra_words is False, no other dictionary word appears at all).
+
+    Only cells that are not part of a placed word are changed. Returns True
+    when the puzzle is unambiguous, False if max_rounds was not enough or an
+    offending word lies entirely on placed cells.
+    """
+    rng = random.Random(seed)
+    placed = {tuple(cell) for cells in words_positions.values() for cell in cells}
+
+    for _ in range(max_rounds):
+        repeated, extra = ambiguous_words(finder.find_all(grid), words_positions)
+        offending = [word_coordinates(word, *occurrence)
+                     for word, occurrences in repeated.items() for occurrence in occurrences]
+        if not allow_extra_words:
+            offending += [word_coordinates(word, *occurrence)
+                          for word, occurrences in extra.items() for occurrence in occurrences]
+        if not offending:
+            return True
+
+        changed = False
+        for cells in offending:
+            filler = [cell for cell in cells if cell not in placed]
+            if filler:
+                row, col = rng.choice(filler)
+                grid.letters[grid.index(row, col)] = rng.choice(ALPHABET)
+                changed = True
+        if not changed:
+            # Every offending word is made of placed letters; re-rolling can't help
+            return False
+
+    repeated, extra = ambiguous_words(finder.find_all(grid), words_positions)
+    return not repeated and (allow_extra_words or not extra)
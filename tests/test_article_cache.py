@@ -0,0 +1,111 @@
+import pytest
+
+import article_cache
+from article_cache import (Article, ArticleCache, ArticleNotCached, DiskStore, article_key, load_fixture,
+                           save_fixture)
+
+
+class FakeFetcher:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def __call__(self, title, lang):
+        self.calls.append((title, lang))
+        text = self.pages.get(title)
+        return None if text is None else Article(title, lang, text)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(article_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DiskStore(str(tmp_path / "articles.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_fetches_once_then_serves_from_cache(store):
+    fetcher = FakeFetcher({"Python": "A programming language."})
+    cache = ArticleCache(store=store, fetcher=fetcher)
+    assert cache.get("Python").text == "A programming language."
+    assert cache.get(" python ").text == "A programming language."
+    assert fetcher.calls == [("Python", "en")]
+
+    # A new process with an empty memory cache reads it back from disk
+    cold = ArticleCache(store=store, fetcher=fetcher)
+    assert cold.get("Python").title == "Python"
+    assert len(fetcher.calls) == 1
+
+
+def test_key_follows_wikipedia_title_rules():
+    assert article_key("red_dwarf") == article_key("Red  dwarf") == article_key("Red dwarf")
+    assert article_key("Red dwarf") != article_key("Red Dwarf")
+    assert article_key("Red dwarf", "en") != article_key("Red dwarf", "de")
+
+
+def test_titles_differing_after_the_first_letter_are_different_articles(store):
+    fetcher = FakeFetcher({"Red Dwarf": "A sitcom.", "Red dwarf": "A small star."})
+    cache = ArticleCache(store=store, fetcher=fetcher)
+    assert cache.get("Red Dwarf").text == "A sitcom."
+    assert cache.get("Red dwarf").text == "A small star."
+    assert cache.get("red_dwarf").text == "A small star."
+    assert len(fetcher.calls) == 2
+
+
+def test_missing_page_is_remembered_briefly(store, clock):
+    fetcher = FakeFetcher({})
+    cache = ArticleCache(store=store, fetcher=fetcher, missing_ttl=60)
+    assert cache.get("Nowhere") is None
+    assert cache.get("Nowhere") is None
+    assert len(fetcher.calls) == 1
+
+    clock[0] += 61
+    fetcher.pages["Nowhere"] = "Created since."
+    assert cache.get("Nowhere").text == "Created since."
+    assert len(fetcher.calls) == 2
+
+
+def test_replay_miss_raises(tmp_path):
+    cache = ArticleCache(replay_dir=str(tmp_path), fetcher=FakeFetcher({"Python": "text"}))
+    with pytest.raises(ArticleNotCached):
+        cache.get("Python")
+    assert cache.fetcher.calls == []
+
+
+def test_fixture_round_trip(tmp_path):
+    article = Article("Łódź", "pl", "Miasto w Polsce.")
+    path = save_fixture(str(tmp_path), article)
+    assert article_key("Łódź", "pl") in path
+    assert load_fixture(str(tmp_path), "Łódź", "pl") == article
+    assert ArticleCache(replay_dir=str(tmp_path)).get("łódź", "pl") == article
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    store = DiskStore(str(tmp_path / "articles.sqlite3"), ttl=3600)
+    store.put("key", Article("Title", "en", "text"))
+    clock[0] += 3599
+    assert store.get("key") == Article("Title", "en", "text")
+    clock[0] += 3602
+    assert store.get("key") is None
+    store.close()
+
+
+def test_least_recently_read_entries_are_evicted(tmp_path, clock):
+    store = DiskStore(str(tmp_path / "articles.sqlite3"), max_bytes=250)
+    for name in "ABC":
+        store.put(name, Article(name, "en", name * 100))
+        clock[0] += 1
+    # Over budget after C: A was read least recently and goes first
+    assert store.get("A") is None
+    store.get("B")
+    clock[0] += 1
+    store.put("D", Article("D", "en", "D" * 100))
+    assert store.get("C") is None
+    assert store.get("B") is not None and store.get("D") is not None
+    store.close()
@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from bench_generation import compare  # noqa: E402
+
+
+def results(*cases):
+    return {"cases": [{"name": name, "wall_seconds": seconds, "success_rate": rate}
+                      for name, seconds, rate in cases]}
+
+
+def test_slower_case_past_the_threshold_is_a_regression():
+    problems = compare(results(("big", 0.50, 1.0)), results(("big", 0.20, 1.0)), threshold=1.25)
+    assert problems == ["big: wall time 0.2000s -> 0.5000s"]
+
+
+def test_slowdown_within_the_threshold_is_fine():
+    assert compare(results(("big", 0.24, 1.0)), results(("big", 0.20, 1.0)), threshold=1.25) == []
+
+
+def test_tiny_cases_are_held_to_the_noise_floor():
+    # Three times slower, but only by 2ms
+    assert compare(results(("small", 0.003, 1.0)), results(("small", 0.001, 1.0)), threshold=1.25) == []
+    assert compare(results(("small", 0.003, 1.0)), results(("small", 0.001, 1.0)),
+                   threshold=1.25, min_delta=0.001) == ["small: wall time 0.0010s -> 0.0030s"]
+
+
+def test_success_rate_drop_is_a_regression():
+    problems = compare(results(("tight", 0.1, 0.9)), results(("tight", 0.1, 1.0)), threshold=1.25)
+    assert problems == ["tight: success rate 1.000 -> 0.900"]
+
+
+def test_new_cases_are_not_compared():
+    assert compare(results(("new", 9.0, 0.0)), results(("old", 0.1, 1.0)), threshold=1.25) == []
@@ -0,0 +1,90 @@
+import random
+import sqlite3
+
+import pytest
+
+from leaderboard import BufferedResultWriter, Leaderboard, LeaderboardWriteError, Result
+
+
+@pytest.fixture
+def board(tmp_path):
+    leaderboard = Leaderboard(str(tmp_path / "leaderboard.sqlite3"))
+    yield leaderboard
+    leaderboard.close()
+
+
+def best_times(results):
+    best = {}
+    for username, _, _, completion_time in results:
+        best[username] = min(completion_time, best.get(username, completion_time))
+    return best
+
+
+def test_top_and_rank_match_a_sorted_list(board):
+    rng = random.Random(0)
+    results = [Result(f"player{rng.randrange(200)}", 10, 5, rng.uniform(0.5, 3600)) for _ in range(5000)]
+    for start in range(0, len(results), 700):
+        board.submit_many(results[start:start + 700])
+    board.submit_many([Result("other", 15, 5, 1.0)])
+
+    best = best_times(results)
+    ordered = sorted(best.items(), key=lambda item: item[1])
+    assert board.top(10, 5, 5) == ordered[:5]
+
+    for username in ("player1", "player2", "player3"):
+        assert board.rank(username, 10, 5) == (sum(t < best[username] for t in best.values()) + 1,
+                                               best[username])
+    assert board.rank("nobody", 10, 5) is None
+
+
+def test_players_are_ranked_by_their_best_time_only(board):
+    board.submit_many([Result("ann", 10, 5, 50.0), Result("bob", 10, 5, 40.0)])
+    board.submit_many([Result("cat", 10, 5, 10.0 + i / 100) for i in range(1000)])
+    board.submit("ann", 10, 5, 60.0)  # slower than her best: changes nothing
+    board.submit("bob", 10, 5, 5.0)   # moves him to another bucket
+
+    assert board.top(10, 5) == [("bob", 5.0), ("cat", 10.0), ("ann", 50.0)]
+    assert board.rank("bob", 10, 5) == (1, 5.0)
+    assert board.rank("cat", 10, 5) == (2, 10.0)
+    assert board.rank("ann", 10, 5) == (3, 50.0)
+
+
+def test_best_times_are_built_for_older_databases(tmp_path):
+    path = str(tmp_path / "leaderboard.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE results (id INTEGER PRIMARY KEY, username TEXT NOT NULL,"
+               " grid_size INTEGER NOT NULL, word_count INTEGER NOT NULL,"
+               " completion_time REAL NOT NULL, created_at REAL NOT NULL)")
+    db.executemany("INSERT INTO results (username, grid_size, word_count, completion_time, created_at)"
+                   " VALUES (?, ?, ?, ?, 0)",
+                   [("ann", 10, 5, 30.0), ("ann", 10, 5, 20.0), ("bob", 10, 5, 25.0)])
+    db.commit()
+    db.close()
+
+    board = Leaderboard(path)
+    assert board.top(10, 5) == [("ann", 20.0), ("bob", 25.0)]
+    assert board.rank("bob", 10, 5) == (2, 25.0)
+    board.close()
+
+
+def test_writer_reports_failed_batches_and_keeps_going(board):
+    class FlakyLeaderboard(Leaderboard):
+        failing = True
+
+        def submit_many(self, results):
+            if self.failing:
+                raise sqlite3.OperationalError("database is locked")
+            super().submit_many(results)
+
+    flaky = FlakyLeaderboard(board.path)
+    writer = BufferedResultWriter(flaky, retry_delay=0)
+    writer.submit("ann", 10, 5, 30.0)
+    with pytest.raises(LeaderboardWriteError):
+        writer.flush()
+    assert writer.failed_results == [Result("ann", 10, 5, 30.0)]
+
+    flaky.failing = False
+    writer.submit("bob", 10, 5, 20.0)
+    writer.flush()
+    writer.close()
+    assert board.top(10, 5) == [("bob", 20.0)]
@@ -0,0 +1,197 @@
+import random
+import time
+
+import pytest
+
+import new_methods_for_grid
+from new_methods_for_grid import (DIRECTIONS, PlacementStats, place_words_on_grid, set_placement_stats,
+                                  try_place_word, update_game_grid)
+from word_grid import WordGrid
+
+WORDS = ["PYTHON", "GRID", "WIKIPEDIA", "WORD", "SEARCH", "LETTER", "PUZZLE"]
+
+
+def read_word(grid, coordinates):
+    return "".join(grid[cell] for cell in coordinates)
+
+
+def test_same_seed_gives_same_puzzle():
+    first, first_positions = place_words_on_grid(WordGrid(12), WORDS, seed=7)
+    second, second_positions = place_words_on_grid(WordGrid(12), WORDS, seed=7)
+    assert first.letters == second.letters
+    assert first_positions == second_positions
+
+
+def test_list_grid_gives_same_layout_as_word_grid():
+    rows = [["*"] * 12 for _ in range(12)]
+    _, list_positions = place_words_on_grid(rows, WORDS, seed=3)
+    grid, grid_positions = place_words_on_grid(WordGrid(12), WORDS, seed=3)
+    assert list_positions == grid_positions
+    assert rows == grid.to_rows()
+
+
+def test_coordinates_spell_the_words():
+    grid, words_positions = place_words_on_grid(WordGrid(15), WORDS, seed=1)
+    assert set(words_positions) == set(WORDS)
+    for word, coordinates in words_positions.items():
+        assert read_word(grid, coordinates) == word
+
+
+@pytest.mark.parametrize("direction", DIRECTIONS)
+def test_try_place_word_in_every_direction(direction):
+    grid = WordGrid(5)
+    d_row, d_col = direction
+    row = 4 if d_row < 0 else 0
+    col = 4 if d_col < 0 else 0
+    assert try_place_word(grid, "WORD", row, col, direction)
+    cells = [(row + d_row * i, col + d_col * i) for i in range(4)]
+    assert read_word(grid, cells) == "WORD"
+
+
+def test_all_directions_are_used():
+    rng = random.Random(0)
+    words = ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(5)) for _ in range(200)]
+    grid, words_positions = place_words_on_grid(WordGrid(40), words, seed=2)
+    used = set()
+    for word, coordinates in words_positions.items():
+        (r0, c0), (r1, c1) = coordinates[:2]
+        used.add((r1 - r0, c1 - c0))
+        assert read_word(grid, coordinates) == word
+    assert used == set(DIRECTIONS)
+
+
+def test_try_place_word_rejects_out_of_bounds_and_conflicts():
+    grid = WordGrid(4)
+    assert not try_place_word(grid, "TOOLONG", 0, 0, True)
+    assert try_place_word(grid, "CAT", 0, 0, True)
+    assert not try_place_word(grid, "DOG", 0, 0, False)
+    assert try_place_word(grid, "COW", 0, 0, False)
+
+
+def test_one_cell_word_on_one_column_grid():
+    grid = WordGrid(3, 1)
+    assert try_place_word(grid, "A", 0, 0, (1, -1))
+    assert grid[0, 0] == "A"
+
+
+TIGHT_WORDS = ["ABCD", "EFGH", "IJKL", "MNOP"]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_search_fills_a_tight_grid(seed):
+    # Every cell is needed, so one badly placed word blocks the others
+    words = TIGHT_WORDS
+    grid, words_positions = place_words_on_grid(WordGrid(4), words, seed=seed)
+    assert set(words_positions) == set(words)
+    assert b"*" not in grid.letters
+
+
+def random_words(count, length, seed):
+    rng = random.Random(seed)
+    return ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(length)) for _ in range(count)]
+
+
+def test_word_longer_than_grid_is_rejected():
+    with pytest.raises(ValueError, match="WIKIPEDIA"):
+        place_words_on_grid(WordGrid(4), ["WIKIPEDIA", "CAT"], seed=0)
+
+
+def test_crossing_words_can_share_every_cell():
+    # 15 letters on 9 cells: only the layout with rows ABC/DEF/GHI fits
+    words = ["ABC", "ADG", "BEH", "CFI", "DEF"]
+    grid, words_positions = place_words_on_grid(WordGrid(3), words, seed=0)
+    assert set(words_positions) == set(words)
+    for word, coordinates in words_positions.items():
+        assert read_word(grid, coordinates) == word
+
+
+@pytest.mark.parametrize("size", [8, 16, 20])
+def test_search_fills_larger_tight_grids(size, capsys):
+    # size random words of size letters always fit one per row, but the
+    # greedy pass sometimes blocks itself by putting one on a diagonal
+    greedy_failures = 0
+    for seed in range(40):
+        words = random_words(size, size, seed)
+        _, greedy_positions = place_words_on_grid(WordGrid(size), words, seed=seed, max_checks=0)
+        greedy_failures += len(greedy_positions) < size
+        capsys.readouterr()
+
+        grid, words_positions = place_words_on_grid(WordGrid(size), words, seed=seed)
+        assert set(words_positions) == set(words)
+        for word, coordinates in words_positions.items():
+            assert read_word(grid, coordinates) == word
+        assert "Could not place" not in capsys.readouterr().out
+    assert greedy_failures
+
+
+@pytest.mark.parametrize("size", [15, 40])
+def test_crowded_puzzle_finishes_in_bounded_time(size, capsys):
+    # 95% of the cells worth of letters
+    words = random_words(size * size * 95 // 800, 8, size)
+    started = time.perf_counter()
+    grid, words_positions = place_words_on_grid(WordGrid(size), words, seed=0)
+    assert time.perf_counter() - started < 1.5
+    assert words_positions
+    for word, coordinates in words_positions.items():
+        assert read_word(grid, coordinates) == word
+    assert capsys.readouterr().out.count("Could not place") == len(set(words)) - len(words_positions)
+
+
+def test_search_budget_keeps_greedy_layout(capsys):
+    # With almost no search budget the tight grid is often left unfinished
+    unfinished = 0
+    for seed in range(20):
+        grid, words_positions = place_words_on_grid(WordGrid(4), TIGHT_WORDS, seed=seed, max_checks=10)
+        for word, coordinates in words_positions.items():
+            assert read_word(grid, coordinates) == word
+        warnings = capsys.readouterr().out.count("Could not place")
+        assert warnings == len(TIGHT_WORDS) - len(words_positions)
+        unfinished += warnings > 0
+    assert unfinished
+
+
+@pytest.fixture
+def stats():
+    stats = PlacementStats()
+    previous = set_placement_stats(stats)
+    yield stats
+    assert set_placement_stats(previous) is stats
+
+
+def test_stats_are_off_by_default():
+    assert set_placement_stats(None) is None
+
+
+def test_stats_count_words_attempts_and_highlights(stats):
+    grid, words_positions = place_words_on_grid(WordGrid(8), ["CAT", "DOG"], seed=0)
+    assert (stats.words, stats.placed, stats.unplaced) == (2, 2, 0)
+    # An empty grid takes the first slot checked for each word
+    assert stats.attempts - stats.rejections == 2
+    assert stats.attempts_per_word == stats.attempts / 2
+
+    update_game_grid(grid, "CAT", 0, words_positions)
+    assert stats.highlights == 1
+    assert stats.as_dict()["attempts_per_word"] == stats.attempts_per_word
+
+
+@pytest.mark.parametrize("lazy_cells", [0, 4, 9])
+def test_stats_count_every_slot_a_scan_covers(stats, lazy_cells):
+    # Whether slots are walked one by one or found with the regex scan,
+    # each of the 9 cells counts for all 8 directions
+    grid = WordGrid.from_rows(["C**", "*X*", "**T"])
+    order = new_methods_for_grid._CellOrder(9, random.Random(0))
+    slots = list(new_methods_for_grid._valid_slots(grid, "CAT", order, random.Random(0),
+                                                   lazy_cells=lazy_cells))
+    assert stats.attempts == 9 * len(DIRECTIONS)
+    assert stats.attempts - stats.rejections == len(slots)
+    assert sorted(slots) == [(0, 0, 0, 1), (0, 0, 1, 0), (0, 2, 1, 0), (2, 0, 0, 1)]
+
+
+def test_stats_count_search_checks_and_backtracks(stats):
+    # Only one layout fits, so the search has to back out of wrong guesses
+    place_words_on_grid(WordGrid(3), ["ABC", "ADG", "BEH", "CFI", "DEF"], seed=0)
+    assert stats.placed == 5
+    assert stats.backtracks > 0
+    # Far more slots than the 9 cells * 8 directions of a single scan
+    assert stats.attempts > 5 * 9 * len(DIRECTIONS)
+    assert 0 < stats.rejections < stats.attempts
@@ -0,0 +1,106 @@
+import gc
+import struct
+
+import pytest
+
+from new_methods_for_grid import GENERATOR_VERSION, create_puzzle
+from puzzle_format import (SEED, PuzzleArchive, PuzzleFormatError, PuzzleView, dumps, dumps_seed, loads,
+                           write_archive)
+
+WORDS = ["PYTHON", "GRID", "WORD", "SEARCH"]
+
+
+def test_full_record_round_trip():
+    grid, words_positions = create_puzzle(10, WORDS, seed=4)
+    loaded_grid, loaded_positions = loads(dumps(grid, words_positions))
+    assert loaded_grid.to_rows() == grid.to_rows()
+    assert loaded_positions == words_positions
+
+
+def test_seed_record_round_trip():
+    grid, words_positions = create_puzzle(10, WORDS, seed=4)
+    view = PuzzleView(dumps_seed(10, WORDS, 4))
+    assert view.words() == WORDS
+    assert view.load()[0].to_rows() == grid.to_rows()
+
+
+# Layouts pinned for GENERATOR_VERSION 1. If one of these changes, the
+# generator's output changed: bump GENERATOR_VERSION and update them.
+GOLDEN = [
+    ((6, ["PYTHON", "GRID", "WORD"], 7),
+     ["KEMUBC", "WORDRD", "DIRGLS", "NOHTYP", "BQGBCN", "NCHCRN"]),
+    # The greedy pass fails on this one, so it goes through the search
+    ((4, ["ABCD", "EFGH", "IJKL", "MNOP"], 13),
+     ["LKJI", "EFGH", "DCBA", "PONM"]),
+]
+
+
+@pytest.mark.parametrize("puzzle, rows", GOLDEN)
+def test_seed_records_rebuild_known_grids(puzzle, rows):
+    assert GENERATOR_VERSION == 1
+    grid_size, words, seed = puzzle
+    grid, words_positions = loads(dumps_seed(grid_size, words, seed))
+    assert ["".join(row) for row in grid.to_rows()] == rows
+    assert set(words_positions) == set(words)
+
+
+def test_seed_record_from_another_generator_is_refused():
+    record = bytearray(dumps_seed(4, ["ABCD"], 13))
+    struct.pack_into("<H", record, struct.calcsize("<3sBBHHQ"), GENERATOR_VERSION + 1)  # after the seed
+    view = PuzzleView(bytes(record))
+    assert view.generator == GENERATOR_VERSION + 1
+    assert view.words() == ["ABCD"]
+    with pytest.raises(PuzzleFormatError, match="generator version"):
+        view.load()
+
+
+def test_version_1_seed_records_are_refused():
+    record = struct.pack("<3sBBHHQH", b"WOP", 1, SEED, 4, 4, 13, 1) + struct.pack("<H", 4) + bytes(3)
+    with pytest.raises(PuzzleFormatError, match="Version 1"):
+        PuzzleView(record)
+
+
+def test_version_1_full_records_still_load():
+    grid, words_positions = create_puzzle(6, ["CAT"], seed=1)
+    record = bytearray(dumps(grid, words_positions))
+    record[3] = 1
+    assert loads(bytes(record))[0].to_rows() == grid.to_rows()
+
+
+@pytest.mark.parametrize("kind", ["full", "seed"])
+def test_truncated_records_raise_format_error(kind):
+    grid, words_positions = create_puzzle(10, WORDS, seed=4)
+    record = dumps(grid, words_positions) if kind == "full" else dumps_seed(10, WORDS, 4)
+    for size in range(len(record)):
+        with pytest.raises(PuzzleFormatError):
+            PuzzleView(record[:size]).load()
+
+
+def test_placement_outside_grid_raises_format_error():
+    grid, words_positions = create_puzzle(6, ["CAT"], seed=1)
+    record = bytearray(dumps(grid, words_positions))
+    record[-7:-3] = (36).to_bytes(4, "little")  # start cell past the last one
+    with pytest.raises(PuzzleFormatError):
+        PuzzleView(bytes(record)).words()
+
+
+def test_archive_can_close_while_views_are_alive(tmp_path):
+    path = tmp_path / "puzzles.wopa"
+    records = [dumps(*create_puzzle(8, WORDS[:2], seed=seed)) for seed in range(3)]
+    assert write_archive(path, records) == 3
+
+    with PuzzleArchive(path) as archive:
+        view = archive[1]
+        assert archive[-1].load()[0].to_rows() == loads(records[2])[0].to_rows()
+    # The file is closed, but the view still reads from the mapping
+    assert archive._file.closed
+    assert view.words() == PuzzleView(records[1]).words()
+    del view
+    gc.collect()
+
+
+def test_archive_rejects_garbage(tmp_path):
+    path = tmp_path / "bad.wopa"
+    path.write_bytes(b"not an archive at all")
+    with pytest.raises(PuzzleFormatError):
+        PuzzleArchive(path)
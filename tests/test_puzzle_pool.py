@@ -0,0 +1,137 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+import puzzle_pool
+from puzzle_pool import PuzzlePool, generate_puzzle, regenerate_puzzle
+
+KEY = (10, 3, "Python")
+
+
+def fake_words(topic, grid_size, word_count):
+    """Picklable stand-in for words_for_topic."""
+    if topic == "Broken":
+        raise LookupError("No Wikipedia article called 'Broken'")
+    return ["PYTHON", "GRID", "WORD", "SNAKE"][:word_count]
+
+
+class ManualExecutor:
+    """Queues jobs until run() is called, so tests decide when puzzles finish."""
+
+    def __init__(self):
+        self.jobs = []
+        self.closed = False
+
+    def submit(self, fn, *args):
+        if self.closed:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        future = Future()
+        self.jobs.append((future, fn, args))
+        return future
+
+    def run(self):
+        jobs, self.jobs = self.jobs, []
+        for future, fn, args in jobs:
+            try:
+                future.set_result(fn(*args))
+            except Exception as error:
+                future.set_exception(error)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.closed = True
+
+
+@pytest.fixture
+def executor():
+    return ManualExecutor()
+
+
+@pytest.fixture
+def pool(executor):
+    with PuzzlePool(refill_threshold=2, target_depth=6, word_source=fake_words, executor=executor) as pool:
+        yield pool
+
+
+def test_get_pops_from_a_warmed_bucket(pool, executor):
+    pool.warm(*KEY)
+    assert len(executor.jobs) == 6
+    executor.run()
+
+    puzzle = pool.get(*KEY)
+    assert puzzle.words == ["PYTHON", "GRID", "WORD"]
+    assert set(puzzle.words_positions) == set(puzzle.words)
+    metrics = pool.metrics()[KEY]
+    assert (metrics["depth"], metrics["served"], metrics["misses"], metrics["generated"]) == (5, 1, 0, 6)
+    assert executor.jobs == []
+
+
+def test_miss_builds_in_the_caller_and_refills(pool, executor):
+    puzzle = pool.get(*KEY)
+    assert puzzle.grid.rows == 10
+    metrics = pool.metrics()[KEY]
+    assert (metrics["misses"], metrics["served"], metrics["in_flight"]) == (1, 0, 6)
+    assert len(executor.jobs) == 6
+
+
+def test_refill_starts_below_the_threshold(pool, executor):
+    pool.warm(*KEY)
+    executor.run()
+    for _ in range(4):
+        pool.get(*KEY)
+    # Two left: not below the threshold yet
+    assert executor.jobs == []
+    pool.get(*KEY)
+    assert len(executor.jobs) == 5
+    assert pool.metrics()[KEY]["in_flight"] == 5
+
+
+def test_failed_jobs_are_counted(pool, executor):
+    key = (10, 3, "Broken")
+    pool.warm(*key)
+    executor.run()
+    metrics = pool.metrics()[key]
+    assert (metrics["failures"], metrics["in_flight"], metrics["depth"]) == (6, 0, 0)
+    assert "No Wikipedia article" in metrics["last_error"]
+
+
+def test_submitting_to_a_closed_executor_releases_the_reservation(pool, executor):
+    pool.close()
+    pool.warm(*KEY)
+    metrics = pool.metrics()[KEY]
+    assert metrics["in_flight"] == 0
+    assert metrics["failures"] == 1
+    assert "after shutdown" in metrics["last_error"]
+    # get() still works, by building the puzzle itself
+    assert pool.get(*KEY).words == ["PYTHON", "GRID", "WORD"]
+
+
+def test_rate_is_averaged_over_the_window(pool, executor, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(puzzle_pool.time, "monotonic", lambda: now[0])
+    pool.warm(*KEY)
+    now[0] += 30
+    executor.run()
+    # Six puzzles in the 30 seconds since the bucket was made
+    assert pool.metrics()[KEY]["puzzles_per_second"] == pytest.approx(6 / 30)
+    now[0] += 61
+    assert pool.metrics()[KEY]["puzzles_per_second"] == 0.0
+
+
+def test_thread_pool_fills_the_bucket():
+    with PuzzlePool(word_source=fake_words, executor=ThreadPoolExecutor(2)) as pool:
+        pool.warm(*KEY)
+    metrics = pool.metrics()[KEY]
+    assert (metrics["depth"], metrics["in_flight"], metrics["failures"]) == (6, 0, 0)
+
+
+def test_regenerate_puzzle_reproduces_the_grid():
+    puzzle = generate_puzzle(*KEY, seed=1234, word_source=fake_words)
+    rebuilt = regenerate_puzzle(puzzle._replace(grid=None, words_positions=None))
+    assert rebuilt.grid.letters == puzzle.grid.letters
+    assert rebuilt.words_positions == puzzle.words_positions
+
+
+def test_regenerate_refuses_another_generator_version():
+    puzzle = generate_puzzle(*KEY, seed=1234, word_source=fake_words)
+    with pytest.raises(ValueError, match="generator version"):
+        regenerate_puzzle(puzzle._replace(generator=puzzle.generator + 1))
@@ -0,0 +1,52 @@
+import io
+
+from renderer import TerminalRenderer
+from word_grid import WordGrid
+
+
+def make_renderer():
+    return TerminalRenderer(stream=io.StringIO(), palette=[], terminal_size=lambda: (80, 24))
+
+
+def test_first_frame_draws_every_cell():
+    grid = WordGrid.from_rows(["ABC", "DEF"])
+    assert make_renderer().draw(grid) == 6
+
+
+def test_only_changed_cells_are_redrawn():
+    grid = WordGrid.from_rows(["ABC", "DEF"])
+    renderer = make_renderer()
+    renderer.draw(grid)
+    assert renderer.draw(grid) == 0
+    grid[1, 2] = "X"
+    assert renderer.draw(grid) == 1
+    assert renderer.draw(grid) == 0
+
+
+def test_change_outside_hint_is_drawn_later():
+    grid = WordGrid.from_rows(["ABC", "DEF"])
+    renderer = make_renderer()
+    renderer.draw(grid)
+    grid[0, 0] = "X"
+    grid[1, 1] = "Y"
+    assert renderer.draw(grid, changed=[(0, 0)]) == 1
+    # (1, 1) was not drawn, so the next full comparison still finds it
+    assert renderer.draw(grid) == 1
+    assert renderer.draw(grid) == 0
+
+
+def test_highlight_is_a_change():
+    grid = WordGrid.from_rows(["ABC", "DEF"])
+    renderer = make_renderer()
+    renderer.draw(grid)
+    grid.highlight([(0, 0), (0, 1)], 0)
+    assert renderer.draw(grid, changed=[(0, 0), (0, 1)]) == 2
+
+
+def test_resize_redraws_everything():
+    grid = WordGrid.from_rows(["ABC", "DEF"])
+    size = [(80, 24)]
+    renderer = TerminalRenderer(stream=io.StringIO(), palette=[], terminal_size=lambda: size[0])
+    renderer.draw(grid)
+    size[0] = (100, 30)
+    assert renderer.draw(grid) == 6
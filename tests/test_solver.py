@@ -0,0 +1,64 @@
+import random
+
+from new_methods_for_grid import DIRECTIONS, word_coordinates
+from solver import WordFinder, ambiguous_words, repair_puzzle
+from word_grid import WordGrid
+
+
+def brute_force(grid, words):
+    found = {}
+    for word in words:
+        for row in range(grid.rows):
+            for col in range(grid.cols):
+                for d_row, d_col in DIRECTIONS:
+                    end_row, end_col = row + d_row * (len(word) - 1), col + d_col * (len(word) - 1)
+                    if not (0 <= end_row < grid.rows and 0 <= end_col < grid.cols):
+                        continue
+                    if "".join(grid[cell] for cell in word_coordinates(word, row, col, d_row, d_col)) == word:
+                        found.setdefault(word, set()).add(cells(word, (row, col, d_row, d_col)))
+    return found
+
+
+def cells(word, occurrence):
+    # A palindrome read both ways is one occurrence
+    return frozenset(word_coordinates(word, *occurrence))
+
+
+def test_find_all_matches_brute_force():
+    rng = random.Random(3)
+    grid = WordGrid.from_rows([[rng.choice("ABCDE") for _ in range(12)] for _ in range(9)])
+    words = {"".join(rng.choice("ABCDE") for _ in range(rng.randint(2, 4))) for _ in range(60)}
+    words |= {"ABA", "ABAB", "BAB"}  # palindromes and overlapping matches
+    found = WordFinder(words).find_all(grid)
+    assert {word: {cells(word, slot) for slot in slots} for word, slots in found.items()} == brute_force(grid, words)
+    assert all(len({cells(word, slot) for slot in slots}) == len(slots) for word, slots in found.items())
+
+
+def test_scan_yields_each_occurrence():
+    grid = WordGrid.from_rows(["CAT", "XXX", "TAC"])
+    assert sorted(WordFinder(["CAT"]).scan(grid)) == [("CAT", 0, 0, 0, 1), ("CAT", 2, 2, 0, -1)]
+
+
+def test_reversal_pair_is_not_a_repeat():
+    grid = WordGrid.from_rows(["TAB", "XYZ", "QRS"])
+    words_positions = {"TAB": [(0, 0), (0, 1), (0, 2)], "BAT": [(0, 2), (0, 1), (0, 0)]}
+    found = WordFinder(["TAB", "BAT"]).find_all(grid)
+    assert ambiguous_words(found, words_positions) == ({}, {})
+    assert repair_puzzle(grid, words_positions, WordFinder(["TAB", "BAT"]), seed=0)
+
+
+def test_repair_removes_second_copy():
+    grid = WordGrid.from_rows(["CAT", "XYZ", "CAT"])
+    words_positions = {"CAT": [(0, 0), (0, 1), (0, 2)]}
+    finder = WordFinder(["CAT"])
+    assert repair_puzzle(grid, words_positions, finder, seed=0)
+    assert grid.to_rows()[0] == list("CAT")
+    assert list(finder.find_all(grid)["CAT"]) == [(0, 0, 0, 1)]
+
+
+def test_repair_gives_up_on_placed_letters():
+    # ACT reads across the placed CAT and ACE, so no filler cell can break it
+    grid = WordGrid.from_rows(["CAT", "ACE", "XYZ"])
+    words_positions = {"CAT": [(0, 0), (0, 1), (0, 2)], "ACE": [(1, 0), (1, 1), (1, 2)]}
+    assert not repair_puzzle(grid, words_positions, WordFinder(["CAT", "ACE", "CC"]),
+                             seed=0, allow_extra_words=False)
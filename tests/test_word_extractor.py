@@ -0,0 +1,81 @@
+import pytest
+
+from word_extractor import (CorpusFrequencies, count_words, extract_words, load_corpus_frequencies, normalise,
+                            rank_words, select_words, tokenize)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("café", "CAFE"),
+    ("naïve", "NAIVE"),
+    ("Łódź", "LODZ"),
+    ("straße", "STRASSE"),
+    ("Ærøskøbing", "AEROSKOBING"),
+    ("Œuvre", "OEUVRE"),
+    ("Þórður", "THORDUR"),
+    ("Đakovo", "DAKOVO"),
+    ("ıstanbul", "ISTANBUL"),
+    ("ﬁnal", "FINAL"),
+])
+def test_normalise_folds_letters(text, expected):
+    assert normalise(text) == expected
+
+
+def test_other_characters_break_words():
+    assert list(tokenize(["one—two", "三three"])) == ["ONE", "TWO", "THREE"]
+
+
+def test_words_are_kept_across_chunks():
+    assert list(tokenize(["Łódź str", "aße café"])) == ["LODZ", "STRASSE", "CAFE"]
+
+
+ARTICLE = "Python is a snake. Python code: python grid! Snakes and code, code, code."
+
+
+def test_count_words_drops_stopwords_and_lengths():
+    chunks = ["The cat sat. The cat ran; a dog", "gy cat is here"]
+    assert count_words(chunks) == {"CAT": 3, "SAT": 1, "RAN": 1, "DOGGY": 1}
+    assert count_words(chunks, max_length=4) == {"CAT": 3, "SAT": 1, "RAN": 1}
+    assert count_words(chunks, min_length=4) == {"DOGGY": 1}
+    assert count_words(chunks, stopwords=frozenset()) == {"THE": 2, "CAT": 3, "SAT": 1, "RAN": 1,
+                                                          "DOGGY": 1, "HERE": 1}
+
+
+def test_rank_words_by_frequency_then_alphabetically():
+    counts = {"PYTHON": 3, "SNAKE": 2, "CODE": 2, "GRID": 1}
+    assert rank_words(counts) == ["PYTHON", "CODE", "SNAKE", "GRID"]
+
+
+def test_rank_words_by_tf_idf():
+    counts = {"PYTHON": 3, "SNAKE": 2, "CODE": 2, "GRID": 1}
+    corpus = CorpusFrequencies(100, {"PYTHON": 99, "CODE": 50, "SNAKE": 1})
+    # Common words sink: PYTHON is in 99 of 100 documents, GRID in none
+    assert rank_words(counts, corpus) == ["SNAKE", "GRID", "CODE", "PYTHON"]
+
+
+def test_load_corpus_frequencies(tmp_path):
+    path = tmp_path / "corpus.tsv"
+    path.write_text("#documents\t100\npython\t99\nSNAKE\t1\n", encoding="utf-8")
+    assert load_corpus_frequencies(str(path)) == CorpusFrequencies(100, {"PYTHON": 99, "SNAKE": 1})
+
+
+def test_select_words_keeps_to_grid_and_letter_budget():
+    ranked = ["WIKIPEDIA", "PYTHON", "SNAKE", "CODE", "GRID", "CAT"]
+    # 6x6 at half the cells is 18 letters; WIKIPEDIA is longer than the grid
+    assert select_words(ranked, 6, 3) == ["PYTHON", "SNAKE", "CODE"]
+    # GRID would go over the 3 letters left, CAT just fits
+    assert select_words(ranked, 6, 10) == ["PYTHON", "SNAKE", "CODE", "CAT"]
+    assert select_words(ranked, 6, 10, letter_budget=0.25) == ["PYTHON", "CAT"]
+
+
+def test_extract_words_from_a_file(tmp_path):
+    path = tmp_path / "article.txt"
+    path.write_text(ARTICLE, encoding="utf-8")
+    with open(path, encoding="utf-8") as f:
+        assert extract_words(f, 6, 3, chunk_size=7) == ["CODE", "PYTHON", "GRID"]
+
+
+def test_extract_words_from_chunks():
+    chunks = [ARTICLE[:14], ARTICLE[14:]]  # splits SNAKE
+    assert extract_words(iter(chunks), 6, 5) == ["CODE", "PYTHON", "GRID"]
+    assert extract_words(ARTICLE, 6, 5, letter_budget=1) == ["CODE", "PYTHON", "GRID", "SNAKE", "SNAKES"]
+    assert extract_words(ARTICLE, 5, 5, letter_budget=1) == ["CODE", "GRID", "SNAKE"]
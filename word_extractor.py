@@ -0,0 +1,171 @@
+import math
+import re
+import unicodedata
+from collections import Counter, namedtuple
+
+CHUNK_SIZE = 64 * 1024
+
+STOPWORDS = frozenset("""
+ABOUT ABOVE AFTER AGAIN AGAINST ALL ALSO AMONG AND ANY ARE AROUND BECAUSE BEEN
+BEFORE BEING BELOW BETWEEN BOTH BUT CAN COULD DID DOES DOING DOWN DURING EACH
+EARLY FEW FOR FROM FURTHER HAD HAS HAVE HAVING HER HERE HERS HERSELF HIM
+HIMSELF HIS HOW INTO ITS ITSELF JUST LATE LATER MANY MAY MORE MOST MUCH MUST
+NEW NOR NOT NOW OFF ONCE ONE ONLY OTHER OUR OURS OURSELVES OUT OVER OWN SAME
+SEE SHE SHOULD SINCE SOME SUCH THAN THAT THE THEIR THEIRS THEM THEMSELVES THEN
+THERE THESE THEY THIS THOSE THROUGH TOO TWO UNDER UNTIL UPON USED USING VERY
+WAS WERE WHAT WHEN WHERE WHICH WHILE WHO WHOM WHOSE WHY WILL WITH WITHIN
+WITHOUT WOULD YET YOU YOUR YOURS
+""".split())
+
+CorpusFrequencies = namedtuple("CorpusFrequencies", ["documents", "counts"])
+
+_WORD = re.compile(r"[A-Z]+")
+_TRAILING_WORD = re.compile(r"[A-Z]+\Z")
+
+# Letters that NFKD leaves alone, with their usual ASCII spelling
+_SPELLED_OUT = str.maketrans({
+    "ß": "SS", "ẞ": "SS", "Æ": "AE", "æ": "AE", "Œ": "OE", "œ": "OE",
+    "Ø": "O", "ø": "O", "Ł": "L", "ł": "L", "Ŀ": "L", "ŀ": "L",
+    "Đ": "D", "đ": "D", "Ð": "D", "ð": "D", "Þ": "TH", "þ": "TH",
+    "Ħ": "H", "ħ": "H", "Ŧ": "T", "ŧ": "T", "Ŋ": "NG", "ŋ": "NG",
+    "ı": "I", "ĸ": "K",
+})
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """
+    Yields the text of 'source' in pieces of about chunk_size characters.
+    'source' can be a string, an open text file or any iterable of strings.
+    """
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+def normalise(text):
+    """
+    Uppercases text and folds accented letters to A-Z ('café' -> 'CAFE').
+
+    Letters that have no decomposition are spelled out ('straße' ->
+    'STRASSE', 'Łódź' -> 'LODZ'). Any other non-ASCII character becomes a
+    space, so it splits words rather than gluing them together.
+    """
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text.translate(_SPELLED_OUT))
+        text = _NON_ASCII.sub(_fold_character, text)
+    return text.upper()
+
+
+def _fold_character(match):
+    # Accents left over from NFKD are dropped, anything else breaks the word
+    return "" if unicodedata.combining(match.group()) else " "
+
+
+def tokenize_chunks(chunks):
+    """
+    Yields one list of uppercase A-Z words per text chunk. A word cut in two
+    by a chunk boundary is held back and joined to the start of the next chunk.
+    """
+    carry = ""
+    for chunk in chunks:
+        text = carry + normalise(chunk)
+        tail = _TRAILING_WORD.search(text)
+        if tail is None:
+            carry = ""
+        else:
+            carry = tail.group()
+            text = text[:tail.start()]
+        yield _WORD.findall(text)
+    if carry:
+        yield [carry]
+
+
+def tokenize(chunks):
+    """Yields uppercase A-Z words from an iterable of text chunks."""
+    for tokens in tokenize_chunks(chunks):
+        yield from tokens
+
+
+def count_words(chunks, min_length=3, max_length=None, stopwords=STOPWORDS):
+    """
+    Counts the words in an iterable of text chunks, dropping stopwords and
+    words outside [min_length, max_length].
+    """
+    counts = Counter()
+    for tokens in tokenize_chunks(chunks):
+        counts.update(tokens)
+    # Filtering once per distinct word is cheaper than once per token
+    for word in list(counts):
+        if len(word) < min_length or (max_length and len(word) > max_length) or word in stopwords:
+            del counts[word]
+    return counts
+
+
+def load_corpus_frequencies(path):
+    """
+    Reads a corpus frequency table: a '#documents<TAB>N' header followed by
+    one 'WORD<TAB>document count' line per word.
+    """
+    counts = {}
+    documents = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            name, _, value = line.rstrip("\n").partition("\t")
+            if name == "#documents":
+                documents = int(value)
+            elif name and value:
+                counts[name.upper()] = int(value)
+    return CorpusFrequencies(documents or max(counts.values(), default=1), counts)
+
+
+def rank_words(counts, corpus=None):
+    """
+    Orders candidate words, best first. Without a corpus table the score is
+    the word's frequency in the article; with one it is TF-IDF.
+    """
+    if corpus is None:
+        def score(word):
+            return counts[word]
+    else:
+        documents = corpus.documents
+
+        def score(word):
+            return counts[word] * math.log((documents + 1) / (corpus.counts.get(word, 0) + 1))
+
+    return sorted(counts, key=lambda word: (-score(word), word))
+
+
+def select_words(ranked, grid_size, word_count, letter_budget=0.5):
+    """
+    Picks up to word_count words from 'ranked' that fit on a grid_size grid
+    and whose letters add up to at most letter_budget of its cells.
+    """
+    budget = int(grid_size * grid_size * letter_budget)
+    chosen = []
+    for word in ranked:
+        if len(chosen) == word_count:
+            break
+        if len(word) > grid_size or len(word) > budget:
+            continue
+        chosen.append(word)
+        budget -= len(word)
+    return chosen
+
+
+def extract_words(source, grid_size, word_count, corpus=None, letter_budget=0.5,
+                  min_length=3, chunk_size=CHUNK_SIZE):
+    """
+    Turns article text into the word list place_words_on_grid expects.
+    Memory use depends on the article's vocabulary, not its length.
+    """
+    counts = count_words(iter_chunks(source, chunk_size), min_length=min_length, max_length=grid_size)
+    return select_words(rank_words(counts, corpus), grid_size, word_count, letter_budget)
@@ -0,0 +1,134 @@
+EMPTY_CELL = "*"
+EMPTY_BYTE = ord(EMPTY_CELL)
+
+
+class WordGrid:
+    """
+    A grid of letters kept in two flat byte buffers.
+
+    'letters' holds one ASCII letter per cell (EMPTY_CELL where nothing is
+    placed yet). 'colours' is a parallel mask: 0 means not highlighted,
+    n > 0 means highlighted with colour n - 1. Cell (row, col) lives at
+    index row * cols + col in both buffers.
+    """
+
+    __slots__ = ("rows", "cols", "letters", "colours")
+
+    def __init__(self, rows, cols=None, fill=EMPTY_CELL):
+        if cols is None:
+            cols = rows
+        self.rows = rows
+        self.cols = cols
+        self.letters = bytearray(fill.encode("ascii") * (rows * cols))
+        self.colours = bytearray(rows * cols)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds a grid from a list of lists (or strings) of single letters."""
+        grid = cls(len(rows), len(rows[0]) if rows else 0)
+        grid.letters[:] = "".join("".join(row) for row in rows).encode("ascii")
+        return grid
+
+    def to_rows(self):
+        """Returns the letters as a list of lists of one-character strings."""
+        return [list(self.row(r).decode("ascii")) for r in range(self.rows)]
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, position):
+        row, col = position
+        return chr(self.letters[row * self.cols + col])
+
+    def __setitem__(self, position, letter):
+        row, col = position
+        self.letters[row * self.cols + col] = ord(letter)
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def copy(self):
+        grid = WordGrid(self.rows, self.cols)
+        grid.letters[:] = self.letters
+        grid.colours[:] = self.colours
+        return grid
+
+    # Line views. Each one is a single slice of the letters buffer.
+
+    def row(self, r):
+        return bytes(self.letters[r * self.cols:(r + 1) * self.cols])
+
+    def column(self, c):
+        return bytes(self.letters[c::self.cols])
+
+    def path(self, row, col, d_row, d_col, length):
+        """Returns the letters on a straight path as bytes; the path must be in bounds."""
+        start = row * self.cols + col
+        if length <= 1:
+            # A one-cell path has no step to slice with (it can be 0 when cols == 1)
+            return bytes(self.letters[start:start + length])
+        step = d_row * self.cols + d_col
+        stop = start + step * length
+        return bytes(self.letters[start:stop if stop >= 0 else None:step])
+
+    def diagonal(self, k):
+        """Down-right diagonal starting at (0, k) for k >= 0, or (-k, 0) for k < 0."""
+        row, col = (0, k) if k >= 0 else (-k, 0)
+        return self.path(row, col, 1, 1, min(self.rows - row, self.cols - col))
+
+    def anti_diagonal(self, k):
+        """Up-right diagonal starting at (rows - 1, k) for k >= 0, or (rows - 1 + k, 0) for k < 0."""
+        row, col = (self.rows - 1, k) if k >= 0 else (self.rows - 1 + k, 0)
+        return self.path(row, col, -1, 1, min(row + 1, self.cols - col))
+
+    def lines(self):
+        """
+        Yields (row, col, d_row, d_col, letters) for every row, column and
+        diagonal, read left to right (top to bottom for columns).
+        """
+        for r in range(self.rows):
+            yield r, 0, 0, 1, self.row(r)
+        for c in range(self.cols):
+            yield 0, c, 1, 0, self.column(c)
+        for k in range(-(self.rows - 1), self.cols):
+            row, col = (0, k) if k >= 0 else (-k, 0)
+            yield row, col, 1, 1, self.diagonal(k)
+        for k in range(-(self.rows - 1), self.cols):
+            row, col = (self.rows - 1, k) if k >= 0 else (self.rows - 1 + k, 0)
+            yield row, col, -1, 1, self.anti_diagonal(k)
+
+    # Highlight layer
+
+    def highlight(self, coordinates, colour):
+        """
+        Marks the cells with colour index 'colour' (O(len(coordinates))).
+        The mask holds one byte per cell, so indexes wrap around after 255.
+        """
+        cols = self.cols
+        value = colour % 255 + 1
+        for r, c in coordinates:
+            self.colours[r * cols + c] = value
+
+    def clear_highlights(self):
+        self.colours[:] = bytes(len(self.colours))
+
+    def render(self, palette=(), reset="", separator=" "):
+        """
+        Returns the grid as text, one line per row. Highlighted cells are
+        wrapped in palette[colour % len(palette)] and 'reset'.
+        """
+        lines = []
+        for r in range(self.rows):
+            start = r * self.cols
+            cells = []
+            for i in range(start, start + self.cols):
+                letter = chr(self.letters[i])
+                colour = self.colours[i]
+                if colour and palette:
+                    letter = palette[(colour - 1) % len(palette)] + letter + reset
+                cells.append(letter)
+            lines.append(separator.join(cells))
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.render()